@@ -0,0 +1,61 @@
+"""use_jsonb_for_result_columns
+
+Revision ID: b71e4a0d2c55
+Revises: 9c3f2d7c4b10
+Create Date: 2026-10-16 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "b71e4a0d2c55"
+down_revision = "9c3f2d7c4b10"
+branch_labels = None
+depends_on = None
+
+
+# (table, column) pairs stored as JSONB. projects.openapi_spec stays JSON so spec key order is kept.
+JSONB_COLUMNS = [
+    ("test_suites", "test_cases"),
+    ("test_suites", "generated_endpoints"),
+    ("test_executions", "results"),
+    ("test_executions", "summary"),
+    ("activity_logs", "details"),
+]
+
+
+def _column_types(inspector, table):
+    return {col['name']: col['type'] for col in inspector.get_columns(table)}
+
+
+def upgrade() -> None:
+    # Convert JSON columns to JSONB (if they aren't already)
+    from sqlalchemy import inspect
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+    
+    for table, column in JSONB_COLUMNS:
+        if table not in tables:
+            continue
+        column_type = _column_types(inspector, table).get(column)
+        if column_type is not None and not isinstance(column_type, postgresql.JSONB):
+            op.alter_column(
+                table,
+                column,
+                type_=postgresql.JSONB(),
+                postgresql_using=f"{column}::jsonb",
+            )
+
+
+def downgrade() -> None:
+    for table, column in reversed(JSONB_COLUMNS):
+        op.alter_column(
+            table,
+            column,
+            type_=sa.JSON(),
+            postgresql_using=f"{column}::json",
+        )
@@ -0,0 +1,46 @@
+"""add_composite_list_indexes
+
+Revision ID: d3a9f6c18e02
+Revises: b71e4a0d2c55
+Create Date: 2026-10-16 00:10:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "d3a9f6c18e02"
+down_revision = "b71e4a0d2c55"
+branch_labels = None
+depends_on = None
+
+
+# (table, composite index, columns, single-column index it replaces)
+COMPOSITE_INDEXES = [
+    ("test_suites", "ix_test_suites_project_created", ["project_id", "created_at"], "ix_test_suites_project_id"),
+    ("test_executions", "ix_test_executions_suite_started", ["test_suite_id", "started_at"], "ix_test_executions_test_suite_id"),
+    ("activity_logs", "ix_activity_logs_project_created", ["project_id", "created_at"], "ix_activity_logs_project_id"),
+]
+
+
+def upgrade() -> None:
+    # Replace single-column FK indexes with (fk, timestamp) indexes (if needed)
+    from sqlalchemy import inspect
+    conn = op.get_bind()
+    inspector = inspect(conn)
+    tables = inspector.get_table_names()
+    
+    for table, index_name, columns, old_index_name in COMPOSITE_INDEXES:
+        if table not in tables:
+            continue
+        indexes = [index['name'] for index in inspector.get_indexes(table)]
+        if index_name not in indexes:
+            op.create_index(index_name, table, columns)
+        if old_index_name in indexes:
+            op.drop_index(old_index_name, table_name=table)
+
+
+def downgrade() -> None:
+    for table, index_name, columns, old_index_name in reversed(COMPOSITE_INDEXES):
+        op.create_index(old_index_name, table, [columns[0]])
+        op.drop_index(index_name, table_name=table)
@@ -2,15 +2,16 @@
 Test execution endpoints.
 """
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Body, Query
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
-import json
 import asyncio
 
 from app.db.database import get_db
+from app.core.serialization import json_dumps
 from app.db.models import TestSuite, TestExecution, ProjectConfig
 from app.services.test_executor import TestExecutor
 from app.core.security import decrypt_data
@@ -104,12 +105,18 @@ def execute_tests(
     Args:
         test_suite_id: Test suite ID
         background_tasks: Background tasks
-        request_body: Optional body with test_indices list
+        request_body: Optional body with test_indices list, and collect_traces /
+            capture_response_bodies flags (both default to true; turn off for bulk
+            status-only runs)
         db: Database session
     """
     test_indices = None
+    executor_options = {}
     if request_body and isinstance(request_body, dict):
         test_indices = request_body.get('test_indices')
+        for option in ('collect_traces', 'capture_response_bodies'):
+            if isinstance(request_body.get(option), bool):
+                executor_options[option] = request_body[option]
     
     # Get test suite
     test_suite = db.query(TestSuite).filter(TestSuite.id == test_suite_id).first()
@@ -151,7 +158,8 @@ def execute_tests(
         _execute_test_suite,
         execution.id,
         test_cases_to_execute,
-        config
+        config,
+        executor_options
     )
     
     return {
@@ -199,40 +207,23 @@ async def stream_execution_results(execution_id: UUID, db: Session = Depends(get
             last_result_count = 0
             
             while True:
-                execution = db_session.query(TestExecution).filter(
-                    TestExecution.id == execution_id
-                ).first()
+                # Sync ORM queries run in the threadpool so polling doesn't block the event loop
+                update = await run_in_threadpool(_load_execution_update, db_session, execution_id)
                 
-                if not execution:
-                    yield f"data: {json.dumps({'error': 'Execution not found'})}\n\n"
+                if update is None:
+                    yield f"data: {json_dumps({'error': 'Execution not found'})}\n\n"
                     break
                 
-                # Get current results
-                current_results = execution.results or []
-                current_count = len(current_results)
-                # Resolve project id for integrations
-                suite = db_session.query(TestSuite).filter(
-                    TestSuite.id == execution.test_suite_id
-                ).first()
-                project_id = str(suite.project_id) if suite and suite.project_id else None
+                current_count = len(update["results"])
                 
                 # Send update if results changed
-                if current_count > last_result_count or execution.status != 'running':
-                    update = {
-                        "execution_id": str(execution.id),
-                        "test_suite_id": str(execution.test_suite_id),
-                        "project_id": project_id,
-                        "status": execution.status,
-                        "summary": execution.summary,
-                        "results": current_results,
-                        "started_at": execution.started_at.isoformat() if execution.started_at else None,
-                        "completed_at": execution.completed_at.isoformat() if execution.completed_at else None,
-                    }
-                    yield f"data: {json.dumps(update)}\n\n"
+                if current_count > last_result_count or update["status"] != 'running':
+                    # Streamed responses bypass the ORJSONResponse default, so encode with orjson here
+                    yield f"data: {json_dumps(update)}\n\n"
                     last_result_count = current_count
                     
                     # Stop if completed
-                    if execution.status in ['completed', 'failed']:
+                    if update["status"] in ['completed', 'failed']:
                         break
                 
                 await asyncio.sleep(0.5)  # Poll every 500ms
@@ -251,7 +242,39 @@ async def stream_execution_results(execution_id: UUID, db: Session = Depends(get
     )
 
 
-def _execute_test_suite(execution_id: UUID, test_cases: list, config):
+def _load_execution_update(db_session: Session, execution_id: UUID) -> Optional[Dict[str, Any]]:
+    """Load the current state of an execution as an SSE payload (None if not found)."""
+    execution = db_session.query(TestExecution).filter(
+        TestExecution.id == execution_id
+    ).first()
+    
+    if not execution:
+        return None
+    
+    # Resolve project id for integrations
+    suite = db_session.query(TestSuite).filter(
+        TestSuite.id == execution.test_suite_id
+    ).first()
+    project_id = str(suite.project_id) if suite and suite.project_id else None
+    
+    return {
+        "execution_id": str(execution.id),
+        "test_suite_id": str(execution.test_suite_id),
+        "project_id": project_id,
+        "status": execution.status,
+        "summary": execution.summary,
+        "results": execution.results or [],
+        "started_at": execution.started_at.isoformat() if execution.started_at else None,
+        "completed_at": execution.completed_at.isoformat() if execution.completed_at else None,
+    }
+
+
+def _execute_test_suite(
+    execution_id: UUID,
+    test_cases: list,
+    config,
+    executor_options: Optional[Dict[str, bool]] = None
+):
     """Execute test suite in background."""
     from app.db.database import SessionLocal
     
@@ -261,7 +284,8 @@ def _execute_test_suite(execution_id: UUID, test_cases: list, config):
         executor = TestExecutor(
             base_url=config.base_url,
             auth_type=config.auth_type,
-            auth_credentials=config.auth_credentials
+            auth_credentials=config.auth_credentials,
+            **(executor_options or {})
         )
         
         # Execute tests with progress updates
@@ -271,9 +295,11 @@ def _execute_test_suite(execution_id: UUID, test_cases: list, config):
         failed = 0
         errors = 0
         
-        for i, test_case in enumerate(test_cases):
+        # Independent tests may run concurrently; results still arrive in suite order
+        for i, (test_case, result, error) in enumerate(executor.iter_test_results(test_cases)):
             try:
-                result = executor.execute_test(test_case)
+                if error is not None:
+                    raise error
                 results.append(result)
                 
                 if result['status'] == 'passed':
@@ -297,6 +323,8 @@ def _execute_test_suite(execution_id: UUID, test_cases: list, config):
                     db.commit()
             
             except Exception as e:
+                # A failed progress commit leaves the session unusable until rolled back
+                db.rollback()
                 errors += 1
                 results.append({
                     'test_name': test_case.get('name', 'Unknown'),
@@ -320,6 +348,7 @@ def _execute_test_suite(execution_id: UUID, test_cases: list, config):
     
     except Exception as e:
         # Update execution with error
+        db.rollback()
         execution = db.query(TestExecution).filter(TestExecution.id == execution_id).first()
         if execution:
             execution.status = "failed"
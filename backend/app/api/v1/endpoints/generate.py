@@ -2,7 +2,7 @@
 Test generation endpoints.
 """
 from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks, Body, Header
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, undefer
 from uuid import UUID
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel
@@ -47,7 +47,7 @@ def generate_tests(
         db: Database session
     """
     # Get project
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project).options(undefer(Project.openapi_spec)).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -2,24 +2,27 @@
 Projects management endpoints.
 """
 from fastapi import APIRouter, HTTPException, Depends, Body, Header, BackgroundTasks
-from sqlalchemy.orm import Session
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session, undefer
 from uuid import UUID
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
+import copy
 import json
 import yaml
-import httpx
 import logging
 
 from app.db.database import get_db
+from app.core.serialization import json_loads
 from app.db.models import Project, TestSuite
-from app.services.openapi_parser import OpenAPIParser
+from app.services.openapi_parser import HTTP_METHODS, OpenAPIParser
 from app.api.v1.endpoints.generate import (
     generate_tests,
     GenerateTestsRequest,
     EndpointFilter,
 )
 from app.api.v1.endpoints.execute import execute_tests
+from app.api.v1.endpoints.upload import fetch_spec_from_url
 from app.services.activity_logger import log_activity
 
 router = APIRouter()
@@ -52,7 +55,7 @@ def list_projects(db: Session = Depends(get_db)):
 @router.get("/{project_id}")
 def get_project(project_id: UUID, db: Session = Depends(get_db)):
     """Get project details."""
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project).options(undefer(Project.openapi_spec)).filter(Project.id == project_id).first()
     
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
@@ -161,7 +164,7 @@ def auto_generate_new_endpoints(
     """
     Generate tests only for newly added endpoints in the OpenAPI spec for this project.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project).options(undefer(Project.openapi_spec)).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -268,7 +271,7 @@ def auto_generate_and_run_new(
       - Generates tests only for those endpoints.
       - Executes just the newly generated tests.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    project = db.query(Project).options(undefer(Project.openapi_spec)).filter(Project.id == project_id).first()
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
@@ -400,49 +403,6 @@ class AddEndpointRequest(BaseModel):
     curl_command: Optional[str] = None
 
 
-async def fetch_spec_from_url(url: str) -> dict:
-    """Fetch and parse OpenAPI spec from URL."""
-    try:
-        if not url or not url.strip():
-            raise HTTPException(status_code=400, detail="URL cannot be empty")
-        
-        url = url.strip()
-        if not url.startswith(('http://', 'https://')):
-            raise HTTPException(status_code=400, detail="URL must start with http:// or https://")
-        
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            content = response.text
-            
-            if not content:
-                raise HTTPException(status_code=400, detail="Empty response from URL")
-            
-            # Try JSON first
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                # Try YAML
-                try:
-                    return yaml.safe_load(content)
-                except yaml.YAMLError as e:
-                    raise HTTPException(status_code=400, detail=f"Invalid YAML: {str(e)}")
-    except httpx.TimeoutException:
-        raise HTTPException(status_code=400, detail="Request timeout: URL did not respond within 30 seconds")
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"HTTP error {e.response.status_code}: Failed to fetch from URL"
-        )
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=400, detail=f"Failed to fetch from URL: {str(e)}")
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"Unexpected error fetching spec from URL: {str(e)}", exc_info=True)
-        raise HTTPException(status_code=500, detail=f"Error fetching spec: {str(e)}")
-
-
 def parse_raw_text(content: str) -> dict:
     """Parse OpenAPI spec from raw text (JSON or YAML)."""
     try:
@@ -452,8 +412,8 @@ def parse_raw_text(content: str) -> dict:
         content = content.strip()
         # Try JSON first
         try:
-            return json.loads(content)
-        except json.JSONDecodeError:
+            return json_loads(content)
+        except json.JSONDecodeError:  # orjson's decode error subclasses this too
             # Try YAML
             try:
                 return yaml.safe_load(content)
@@ -626,7 +586,8 @@ async def add_endpoints_manually(
     Add endpoints to an existing project by fetching from URL or parsing raw OpenAPI text.
     Merges new paths into the existing OpenAPI spec.
     """
-    project = db.query(Project).filter(Project.id == project_id).first()
+    # Sync ORM calls go through the threadpool so this async handler doesn't block the event loop
+    project = await run_in_threadpool(db.query(Project).options(undefer(Project.openapi_spec)).filter(Project.id == project_id).first)
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
@@ -647,7 +608,8 @@ async def add_endpoints_manually(
     # Parse and validate the new spec
     try:
         new_parser = OpenAPIParser(spec_dict=new_spec_dict)
-        new_resolved_spec = new_parser.parse()
+        # Its nodes get merged into the project spec, so don't share them with the parse cache
+        new_resolved_spec = copy.deepcopy(new_parser.parse(validate=True))
         
         if not new_resolved_spec:
             raise HTTPException(status_code=400, detail="Failed to resolve OpenAPI specification")
@@ -685,7 +647,7 @@ async def add_endpoints_manually(
             # Path exists - merge methods
             existing_path_item = merged_paths[path]
             for method, operation in path_item.items():
-                if method in ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']:
+                if method in HTTP_METHODS:
                     if method not in existing_path_item:
                         # New method for existing path
                         existing_path_item[method] = operation
@@ -727,8 +689,8 @@ async def add_endpoints_manually(
     
     # Update project
     project.openapi_spec = existing_spec
-    db.commit()
-    db.refresh(project)
+    await run_in_threadpool(db.commit)
+    await run_in_threadpool(db.refresh, project)
     
     # Log activity
     try:
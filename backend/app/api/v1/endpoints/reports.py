@@ -2,9 +2,11 @@
 Reports and analytics endpoints.
 """
 import re
+import string
+from collections import defaultdict
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import case, func, and_, or_
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
 from uuid import UUID
@@ -14,6 +16,9 @@ from app.db.models import Project, TestSuite, TestExecution, ProjectConfig
 
 router = APIRouter()
 
+# Characters allowed in long opaque ID segments (Pattern 7 in normalize_endpoint_path)
+_IDCHARS = frozenset(string.ascii_letters + string.digits + '-_')
+
 
 def _update_endpoint_stats(endpoint_stats: Dict[str, Any], result: Dict[str, Any]) -> None:
     """
@@ -113,13 +118,12 @@ def normalize_endpoint_path(endpoint: str) -> str:
         is_dynamic = False
         placeholder = '{id}'
         
-        # Pattern 1: UUIDs
-        uuid_pattern = r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$'
-        if re.match(uuid_pattern, part, re.IGNORECASE):
+        # Pattern 1: Numeric IDs (checked first - the most common dynamic segment)
+        if part.isdigit():
             is_dynamic = True
             placeholder = '{id}'
-        # Pattern 2: Numeric IDs
-        elif re.match(r'^\d+$', part):
+        # Pattern 2: UUIDs
+        elif re.match(r'^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$', part, re.IGNORECASE):
             is_dynamic = True
             placeholder = '{id}'
         # Pattern 3: Contains special characters (SQL injection, XSS, etc.) - definitely dynamic
@@ -156,7 +160,7 @@ def normalize_endpoint_path(endpoint: str) -> str:
             is_dynamic = True
             placeholder = '{username}'
         # Pattern 7: Long alphanumeric strings (likely IDs)
-        elif len(part) > 10 and re.match(r'^[a-z0-9_\-]+$', part, re.IGNORECASE):
+        elif len(part) > 10 and all(c in _IDCHARS for c in part):
             is_dynamic = True
             placeholder = '{id}'
         # Pattern 8: If it's not a common static segment and doesn't look like a standard path,
@@ -382,7 +386,12 @@ def get_last_run_report(
     db: Session = Depends(get_db)
 ):
     """Get the last test execution report with detailed results."""
-    query = db.query(TestExecution).order_by(TestExecution.started_at.desc())
+    # Fetch the suite name with the execution (one round-trip instead of two)
+    query = (
+        db.query(TestExecution, TestSuite.name)
+        .outerjoin(TestSuite, TestSuite.id == TestExecution.test_suite_id)
+        .order_by(TestExecution.started_at.desc())
+    )
     
     if test_suite_id:
         query = query.filter(TestExecution.test_suite_id == test_suite_id)
@@ -392,13 +401,12 @@ def get_last_run_report(
         ).subquery()
         query = query.filter(TestExecution.test_suite_id.in_(test_suites))
     
-    last_execution = query.first()
+    row = query.first()
     
-    if not last_execution:
+    if not row:
         raise HTTPException(status_code=404, detail="No executions found")
     
-    # Get test suite info
-    test_suite = db.query(TestSuite).filter(TestSuite.id == last_execution.test_suite_id).first()
+    last_execution, test_suite_name = row
     
     # Aggregate metrics from this single execution
     results = last_execution.results or []
@@ -450,7 +458,7 @@ def get_last_run_report(
     return {
         'execution_id': str(last_execution.id),
         'test_suite_id': str(last_execution.test_suite_id),
-        'test_suite_name': test_suite.name if test_suite else 'Unknown',
+        'test_suite_name': test_suite_name or 'Unknown',
         'status': last_execution.status,
         'started_at': last_execution.started_at.isoformat() if last_execution.started_at else None,
         'completed_at': last_execution.completed_at.isoformat() if last_execution.completed_at else None,
@@ -624,30 +632,61 @@ def get_projects_with_test_suites(
     db: Session = Depends(get_db)
 ):
     """Get all projects with their test suites for global reports."""
-    projects = db.query(Project).all()
+    # Suites come in one IN (...) query instead of one query per project; their
+    # test_cases blobs are not loaded - only the counts are needed here
+    projects = db.query(Project).options(
+        selectinload(Project.test_suites).load_only(TestSuite.id, TestSuite.project_id, TestSuite.name)
+    ).all()
+    suite_ids = [suite.id for project in projects for suite in project.test_suites]
+    
+    # Test counts, execution counts and latest execution for all suites: one query each
+    test_counts: Dict[UUID, int] = {}
+    execution_counts: Dict[UUID, int] = {}
+    latest_executions: Dict[UUID, Any] = {}
+    if suite_ids:
+        test_counts = dict(
+            db.query(
+                TestSuite.id,
+                case(
+                    (func.jsonb_typeof(TestSuite.test_cases) == 'array', func.jsonb_array_length(TestSuite.test_cases)),
+                    else_=0,
+                ),
+            )
+            .filter(TestSuite.id.in_(suite_ids))
+            .all()
+        )
+        execution_counts = dict(
+            db.query(TestExecution.test_suite_id, func.count(TestExecution.id))
+            .filter(TestExecution.test_suite_id.in_(suite_ids))
+            .group_by(TestExecution.test_suite_id)
+            .all()
+        )
+        latest_rows = (
+            db.query(
+                TestExecution.test_suite_id,
+                TestExecution.id,
+                TestExecution.status,
+                TestExecution.started_at,
+                TestExecution.completed_at,
+            )
+            .filter(TestExecution.test_suite_id.in_(suite_ids))
+            .distinct(TestExecution.test_suite_id)
+            .order_by(TestExecution.test_suite_id, TestExecution.started_at.desc())
+            .all()
+        )
+        latest_executions = {row.test_suite_id: row for row in latest_rows}
     
     result = []
     for project in projects:
-        test_suites = db.query(TestSuite).filter(
-            TestSuite.project_id == project.id
-        ).all()
-        
-        # Get execution counts for each test suite
         test_suites_data = []
-        for suite in test_suites:
-            execution_count = db.query(TestExecution).filter(
-                TestExecution.test_suite_id == suite.id
-            ).count()
-            
-            # Get latest execution
-            latest_execution = db.query(TestExecution).filter(
-                TestExecution.test_suite_id == suite.id
-            ).order_by(TestExecution.started_at.desc()).first()
+        for suite in project.test_suites:
+            execution_count = execution_counts.get(suite.id, 0)
+            latest_execution = latest_executions.get(suite.id)
             
             test_suites_data.append({
                 'id': str(suite.id),
                 'name': suite.name,
-                'test_count': len(suite.test_cases) if suite.test_cases else 0,
+                'test_count': test_counts.get(suite.id, 0),
                 'execution_count': execution_count,
                 'latest_execution': {
                     'id': str(latest_execution.id) if latest_execution else None,
@@ -788,18 +827,15 @@ def get_endpoint_test_cases(
             test_suite_name = test_suite.name
     
     # Group test cases by test type
-    test_cases_by_type = {}
+    test_cases_by_type = defaultdict(list)
     for test_case in test_cases:
-        test_type = test_case.get('test_type', 'unknown')
-        if test_type not in test_cases_by_type:
-            test_cases_by_type[test_type] = []
-        test_cases_by_type[test_type].append(test_case)
+        test_cases_by_type[test_case.get('test_type', 'unknown')].append(test_case)
     
     return {
         'endpoint': endpoint_path,
         'method': method.upper(),
         'test_cases': test_cases,
-        'test_cases_by_type': test_cases_by_type,  # Grouped by type
+        'test_cases_by_type': dict(test_cases_by_type),  # Grouped by type
         'total_count': len(test_cases),
         'test_suite_id': str(test_suite_id) if test_suite_id else None,
         'test_suite_name': test_suite_name,
@@ -3,22 +3,153 @@ Upload OpenAPI/Swagger specification endpoint.
 """
 import json
 import logging
+import sys
 import yaml
 import httpx
+from collections import OrderedDict
+from itertools import islice
 from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Body
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import Optional
+from typing import BinaryIO, Optional, Union
 from pydantic import BaseModel, HttpUrl
 
 from app.db.database import get_db
 from app.db.models import Project
+from app.core.serialization import json_loads
 from app.services.openapi_parser import OpenAPIParser
 
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    # PyYAML built without libyaml - fall back to the pure-Python loader
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Parsed specs fetched from URLs, revalidated with ETag/Last-Modified on the next fetch.
+# url -> (etag, last_modified, spec); least recently used first.
+_SPEC_CACHE_MAX_SIZE = 32
+_SPEC_CACHE: "OrderedDict[str, tuple]" = OrderedDict()
+
+# Shared client so repeat fetches from the same host reuse pooled keep-alive connections.
+# Created on first use and closed on application shutdown (see app.main lifespan); a
+# later lifespan (e.g. another TestClient) gets a new one.
+_HTTP_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared HTTP client for spec fetches, creating it if needed."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is None or _HTTP_CLIENT.is_closed:
+        _HTTP_CLIENT = httpx.AsyncClient(
+            http2=_HTTP2_AVAILABLE,
+            timeout=30.0,
+            follow_redirects=True,
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _HTTP_CLIENT
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client used for spec fetches."""
+    global _HTTP_CLIENT
+    if _HTTP_CLIENT is not None:
+        await _HTTP_CLIENT.aclose()
+        _HTTP_CLIENT = None
+
+
+def _detect_spec_format(name: Optional[str], content_type: str = "") -> Optional[str]:
+    """Guess 'json' or 'yaml' from a file name/URL suffix or Content-Type (None if unknown)."""
+    name = (name or "").lower().split("?", 1)[0]
+    content_type = content_type.lower()
+    if name.endswith((".yaml", ".yml")) or "yaml" in content_type:
+        return "yaml"
+    if name.endswith(".json") or "json" in content_type:
+        return "json"
+    return None
+
+
+# Schema type names repeat throughout a spec; interned along with all dict keys
+_INTERNED_SPEC_VALUES = frozenset({"string", "integer", "number", "object", "array", "boolean"})
+
+
+def _intern_spec(node, memo: Optional[dict] = None):
+    """
+    Return a copy of a YAML-loaded spec with interned dict keys and schema type names.
+    
+    The YAML loader creates a new str for every occurrence of "type", "schema", etc.,
+    whereas the JSON decoders already reuse key objects. Shared (anchored) nodes stay
+    shared via memo, which also guards against recursive anchors.
+    """
+    if memo is None:
+        memo = {}
+    if isinstance(node, dict):
+        if id(node) in memo:
+            return memo[id(node)]
+        interned = memo[id(node)] = {}
+        for key, value in node.items():
+            interned[sys.intern(key) if isinstance(key, str) else key] = _intern_spec(value, memo)
+        return interned
+    if isinstance(node, list):
+        if id(node) in memo:
+            return memo[id(node)]
+        interned = memo[id(node)] = []
+        interned.extend(_intern_spec(value, memo) for value in node)
+        return interned
+    if isinstance(node, str) and node in _INTERNED_SPEC_VALUES:
+        return sys.intern(node)
+    return node
+
+
+def _load_yaml_spec(content):
+    """Load a YAML spec and intern its repeated strings."""
+    return _intern_spec(yaml.load(content, Loader=_YamlLoader))
+
+
+def _load_spec(content, spec_format: Optional[str] = None) -> dict:
+    """Parse spec content with the parser for spec_format, or JSON then YAML when unknown."""
+    if spec_format == "yaml":
+        try:
+            return _load_yaml_spec(content)
+        except yaml.YAMLError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid YAML: {str(e)}")
+    if spec_format == "json":
+        try:
+            return json_loads(content)
+        except json.JSONDecodeError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
+    
+    # Unknown format - try JSON first, then YAML
+    try:
+        return json_loads(content)
+    except json.JSONDecodeError:
+        try:
+            return _load_yaml_spec(content)
+        except yaml.YAMLError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid YAML: {str(e)}")
+
+
+def _cache_spec(url: str, response: httpx.Response, spec: dict) -> None:
+    """Remember a fetched spec if the server gave us a validator to revalidate it with."""
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    if not etag and not last_modified:
+        return
+    _SPEC_CACHE[url] = (etag, last_modified, spec)
+    _SPEC_CACHE.move_to_end(url)
+    while len(_SPEC_CACHE) > _SPEC_CACHE_MAX_SIZE:
+        _SPEC_CACHE.popitem(last=False)
+
 
 class URLUploadRequest(BaseModel):
     """Request model for URL-based upload."""
@@ -27,7 +158,13 @@ class URLUploadRequest(BaseModel):
 
 
 async def fetch_spec_from_url(url: str) -> dict:
-    """Fetch and parse OpenAPI spec from URL."""
+    """
+    Fetch and parse OpenAPI spec from URL.
+    
+    Specs are cached per URL and revalidated with a conditional GET, so an unchanged
+    spec (304 Not Modified) is returned without downloading or parsing it again.
+    The returned dict may be shared with the cache and must not be mutated.
+    """
     try:
         # Validate URL format
         if not url or not url.strip():
@@ -38,23 +175,30 @@ async def fetch_spec_from_url(url: str) -> dict:
         if not url.startswith(('http://', 'https://')):
             raise HTTPException(status_code=400, detail="URL must start with http:// or https://")
         
-        async with httpx.AsyncClient(timeout=30.0, follow_redirects=True) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            content = response.text
-            
-            if not content:
-                raise HTTPException(status_code=400, detail="Empty response from URL")
-            
-            # Try JSON first
-            try:
-                return json.loads(content)
-            except json.JSONDecodeError:
-                # Try YAML
-                try:
-                    return yaml.safe_load(content)
-                except yaml.YAMLError as e:
-                    raise HTTPException(status_code=400, detail=f"Invalid YAML: {str(e)}")
+        cached = _SPEC_CACHE.get(url)
+        request_headers = {}
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                request_headers["If-None-Match"] = etag
+            if last_modified:
+                request_headers["If-Modified-Since"] = last_modified
+        
+        response = await _get_http_client().get(url, headers=request_headers)
+        if response.status_code == 304 and cached:
+            _SPEC_CACHE.move_to_end(url)
+            return cached[2]
+        response.raise_for_status()
+        content = response.content
+        
+        if not content:
+            raise HTTPException(status_code=400, detail="Empty response from URL")
+        
+        # Pick the parser from the URL suffix / Content-Type when possible
+        spec_format = _detect_spec_format(url, response.headers.get("content-type", ""))
+        spec = _load_spec(content, spec_format)
+        _cache_spec(url, response, spec)
+        return spec
     except httpx.TimeoutException:
         raise HTTPException(status_code=400, detail="Request timeout: URL did not respond within 30 seconds")
     except httpx.HTTPStatusError as e:
@@ -71,22 +215,21 @@ async def fetch_spec_from_url(url: str) -> dict:
         raise HTTPException(status_code=500, detail=f"Error fetching spec: {str(e)}")
 
 
-async def parse_spec_content(content: bytes, filename: Optional[str] = None) -> dict:
-    """Parse OpenAPI spec content (JSON or YAML)."""
+async def parse_spec_content(content: Union[bytes, BinaryIO], filename: Optional[str] = None) -> dict:
+    """Parse OpenAPI spec content (JSON or YAML) from bytes or, for YAML, a binary stream."""
     try:
-        # Try JSON first
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError:
-            # Try YAML
-            try:
-                return yaml.safe_load(content)
-            except yaml.YAMLError as e:
-                raise HTTPException(status_code=400, detail=f"Invalid YAML: {str(e)}")
+        return _load_spec(content, _detect_spec_format(filename))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to parse spec: {str(e)}")
 
 
+def _save_project(db: Session, project: Project) -> None:
+    """Insert a project (sync ORM - async handlers call this via run_in_threadpool)."""
+    db.add(project)
+    db.commit()
+    db.refresh(project)
+
+
 @router.post("/url")
 async def upload_spec_from_url(
     request: URLUploadRequest = Body(...),
@@ -119,7 +262,7 @@ async def upload_spec_from_url(
         # Parse and validate OpenAPI spec
         logger.info("Parsing OpenAPI specification")
         parser = OpenAPIParser(spec_dict=spec_dict)
-        resolved_spec = parser.parse()
+        resolved_spec = parser.parse(validate=True)
         
         if not resolved_spec:
             raise HTTPException(status_code=400, detail="Failed to resolve OpenAPI specification")
@@ -141,29 +284,28 @@ async def upload_spec_from_url(
             original_file_name=request.url
         )
         
-        db.add(project)
-        db.commit()
-        db.refresh(project)
+        await run_in_threadpool(_save_project, db, project)
         
-        # Get endpoints summary
-        endpoints = parser.get_endpoints()
+        # Get endpoints summary (only the preview endpoints are materialized)
+        endpoints_count = parser.count_endpoints()
+        preview_endpoints = list(islice(parser.iter_endpoints(), 10))  # Limit to 10 for preview
         
-        logger.info(f"Successfully created project {project.id} with {len(endpoints)} endpoints")
+        logger.info(f"Successfully created project {project.id} with {endpoints_count} endpoints")
         
         return {
             "project_id": str(project.id),
             "name": project.name,
             "description": project.description,
-            "endpoints_count": len(endpoints),
+            "endpoints_count": endpoints_count,
             "endpoints": [
                 {
                     "path": ep['path'],
                     "method": ep['method'],
                     "operation_id": ep['operation_id']
                 }
-                for ep in endpoints[:10]  # Limit to 10 for preview
+                for ep in preview_endpoints
             ],
-            "collections_count": len(parser.get_schemas()),
+            "collections_count": parser.schema_count,
             "message": "Specification fetched and parsed successfully"
         }
     
@@ -201,15 +343,18 @@ async def upload_spec(
         raise HTTPException(status_code=400, detail="File is required")
     
     try:
-        # Read file content
-        content = await file.read()
-        
-        # Parse JSON or YAML
-        spec_dict = await parse_spec_content(content, file.filename)
+        # Parse JSON or YAML. YAML is read incrementally from the spooled upload file;
+        # JSON needs the full buffer for the decoder.
+        if _detect_spec_format(file.filename) == "yaml":
+            await file.seek(0)
+            spec_dict = await parse_spec_content(file.file, file.filename)
+        else:
+            content = await file.read()
+            spec_dict = await parse_spec_content(content, file.filename)
         
         # Parse and validate OpenAPI spec
         parser = OpenAPIParser(spec_dict=spec_dict)
-        resolved_spec = parser.parse()
+        resolved_spec = parser.parse(validate=True)
         
         # Extract metadata
         info = resolved_spec.get('info', {})
@@ -227,27 +372,26 @@ async def upload_spec(
             original_file_name=file.filename
         )
         
-        db.add(project)
-        db.commit()
-        db.refresh(project)
+        await run_in_threadpool(_save_project, db, project)
         
-        # Get endpoints summary
-        endpoints = parser.get_endpoints()
+        # Get endpoints summary (only the preview endpoints are materialized)
+        endpoints_count = parser.count_endpoints()
+        preview_endpoints = list(islice(parser.iter_endpoints(), 10))  # Limit to 10 for preview
         
         return {
             "project_id": str(project.id),
             "name": project.name,
             "description": project.description,
-            "endpoints_count": len(endpoints),
+            "endpoints_count": endpoints_count,
             "endpoints": [
                 {
                     "path": ep['path'],
                     "method": ep['method'],
                     "operation_id": ep['operation_id']
                 }
-                for ep in endpoints[:10]  # Limit to 10 for preview
+                for ep in preview_endpoints
             ],
-            "collections_count": len(parser.get_schemas()),
+            "collections_count": parser.schema_count,
             "message": "Specification uploaded and parsed successfully"
         }
     
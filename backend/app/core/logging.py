@@ -1,31 +1,48 @@
 """
 Logging configuration.
 """
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
+
+# Background listener that performs the actual file/stdout writes
+_queue_listener: Optional[QueueListener] = None
 
 
 def setup_logging():
     """Configure application logging."""
+    global _queue_listener
+    if _queue_listener is not None:
+        return
+    
     # Create logs directory
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
     
-    # Configure root logger
-    logging.basicConfig(
-        level=logging.INFO,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            RotatingFileHandler(
-                log_dir / "app.log",
-                maxBytes=10 * 1024 * 1024,  # 10MB
-                backupCount=5
-            ),
-            logging.StreamHandler(sys.stdout)
-        ]
+    formatter = logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    file_handler = RotatingFileHandler(
+        log_dir / "app.log",
+        maxBytes=10 * 1024 * 1024,  # 10MB
+        backupCount=5
     )
+    stream_handler = logging.StreamHandler(sys.stdout)
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+    
+    # Request threads only enqueue records; the listener thread does rotation and write() calls
+    log_queue: queue.Queue = queue.Queue(-1)
+    _queue_listener = QueueListener(log_queue, file_handler, stream_handler, respect_handler_level=True)
+    _queue_listener.start()
+    atexit.register(_queue_listener.stop)  # Flush queued records on shutdown
+    
+    # Configure root logger (no formatter on the QueueHandler - the listener's handlers format)
+    root_logger = logging.getLogger()
+    root_logger.setLevel(logging.INFO)
+    root_logger.addHandler(QueueHandler(log_queue))
     
     # Set specific log levels
     logging.getLogger("uvicorn").setLevel(logging.INFO)
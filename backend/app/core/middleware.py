@@ -15,16 +15,18 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
     """Middleware for request monitoring."""
     
     async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
+        start_ns = time.perf_counter_ns()
         
         # Process request
         response = await call_next(request)
         
         # Calculate duration
-        duration = time.time() - start_time
+        duration = (time.perf_counter_ns() - start_ns) * 1e-9
         
-        # Record metrics
-        endpoint = request.url.path
+        # Record metrics under the matched route template (e.g. /api/v1/projects/{project_id})
+        # rather than the raw path, so label cardinality is bounded by the number of routes.
+        route = request.scope.get("route")
+        endpoint = getattr(route, "path", None) or "unmatched"
         method = request.method
         status = response.status_code
         
@@ -33,7 +35,7 @@ class MonitoringMiddleware(BaseHTTPMiddleware):
         # Log slow requests
         if duration > 1.0:
             logger.warning(
-                f"Slow request: {method} {endpoint} took {duration:.2f}s"
+                f"Slow request: {method} {request.url.path} took {duration:.2f}s"
             )
         
         return response
@@ -1,20 +1,36 @@
 """
 Security utilities for encryption and authentication.
 """
-from cryptography.fernet import Fernet
+import base64
+import hashlib
+import hmac
+import logging
+import os
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional
 
 from app.core.config import settings
 
-# Password hashing
+logger = logging.getLogger(__name__)
+
+# Password hashing (human passwords only - bcrypt is deliberately slow)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 # Encryption for sensitive data
+@lru_cache(maxsize=1)
 def get_fernet():
-    """Get or create Fernet instance for encryption."""
+    """
+    Get or create Fernet instance for encryption.
+    
+    The instance is cached; call get_fernet.cache_clear() after changing ENCRYPTION_KEY.
+    """
     try:
         key = settings.ENCRYPTION_KEY.encode()
         if len(key) != 44:  # Fernet keys are 44 bytes when base64 encoded
@@ -26,39 +42,77 @@ def get_fernet():
         settings.ENCRYPTION_KEY = key.decode()
         return Fernet(key)
 
-fernet = get_fernet()
+
+# HKDF label separating the AES-GCM key from the Fernet (HMAC + AES-CBC) keys
+_AEAD_KEY_INFO = b"aesgcm-v1"
+
+
+@lru_cache(maxsize=1)
+def get_aead() -> AESGCM:
+    """
+    Get AES-256-GCM cipher keyed from ENCRYPTION_KEY.
+    
+    Fernet uses the raw key bytes for its own HMAC and AES-CBC keys, so the GCM key
+    is derived from them with HKDF-SHA256 rather than reused directly.
+    Cached like get_fernet(); clear both caches after changing ENCRYPTION_KEY.
+    """
+    get_fernet()  # Ensures ENCRYPTION_KEY holds a valid 32-byte urlsafe-base64 key
+    key = HKDF(
+        algorithm=hashes.SHA256(),
+        length=32,
+        salt=None,
+        info=_AEAD_KEY_INFO,
+    ).derive(base64.urlsafe_b64decode(settings.ENCRYPTION_KEY))
+    return AESGCM(key)
+
+
+# Legacy Fernet tokens start with the base64 of the 0x80 version byte + timestamp
+_FERNET_TOKEN_PREFIX = b"gAAAAA"
+_GCM_NONCE_SIZE = 12
+
+
+def _aead_encrypt(data: str) -> str:
+    """Encrypt with AES-GCM; token is urlsafe-base64(nonce + ciphertext + tag)."""
+    nonce = os.urandom(_GCM_NONCE_SIZE)
+    return base64.urlsafe_b64encode(nonce + get_aead().encrypt(nonce, data.encode(), None)).decode()
 
 
 def encrypt_data(data: str) -> str:
     """Encrypt sensitive data."""
     try:
-        f = get_fernet()
-        return f.encrypt(data.encode()).decode()
+        return _aead_encrypt(data)
     except Exception:
         # If encryption fails, generate new key (for first run)
-        f = Fernet.generate_key()
-        settings.ENCRYPTION_KEY = f.decode()
-        return Fernet(f).encrypt(data.encode()).decode()
+        settings.ENCRYPTION_KEY = Fernet.generate_key().decode()
+        get_fernet.cache_clear()
+        get_aead.cache_clear()
+        return _aead_encrypt(data)
 
 
 def decrypt_data(encrypted_data: str) -> str:
-    """Decrypt sensitive data."""
+    """Decrypt sensitive data (AES-GCM tokens, or legacy Fernet tokens)."""
     if not encrypted_data:
         raise ValueError("No encrypted data provided")
     
     try:
-        f = get_fernet()
-        return f.decrypt(encrypted_data.encode()).decode()
+        token = encrypted_data.encode()
+        if token.startswith(_FERNET_TOKEN_PREFIX):
+            try:
+                return get_fernet().decrypt(token).decode()
+            except InvalidToken:
+                # An AES-GCM token can share the prefix by chance - try that below
+                pass
+        raw = base64.urlsafe_b64decode(token)
+        nonce, ciphertext = raw[:_GCM_NONCE_SIZE], raw[_GCM_NONCE_SIZE:]
+        return get_aead().decrypt(nonce, ciphertext, None).decode()
     except Exception as e:
         # Log the error for debugging
-        import logging
-        logger = logging.getLogger(__name__)
         error_type = type(e).__name__
         error_msg = str(e)
         logger.error(f"Decryption failed: {error_type} - {error_msg}")
         
         # Provide more specific error messages
-        if "InvalidToken" in error_type or "InvalidToken" in error_msg:
+        if error_type in ("InvalidToken", "InvalidTag") or "InvalidToken" in error_msg:
             raise ValueError(
                 "Encrypted data is invalid or corrupted. This usually happens when the encryption key has changed. "
                 "Please re-enter your API key."
@@ -82,6 +136,25 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def hash_api_key(api_key: str) -> str:
+    """
+    Hash a machine-generated secret (API key, webhook token) with keyed BLAKE2b.
+    
+    Microseconds per call instead of bcrypt's ~200ms. Only safe for high-entropy
+    secrets; use hash_password() for anything a human chose.
+    """
+    return hashlib.blake2b(
+        api_key.encode(),
+        key=settings.SECRET_KEY.encode()[:64],
+        digest_size=32,
+    ).hexdigest()
+
+
+def verify_api_key(api_key: str, hashed_api_key: str) -> bool:
+    """Verify an API key against hash_api_key() output in constant time."""
+    return hmac.compare_digest(hash_api_key(api_key), hashed_api_key)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create JWT access token."""
     to_encode = data.copy()
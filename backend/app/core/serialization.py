@@ -0,0 +1,76 @@
+"""
+JSON serialization helpers (orjson when installed, stdlib json otherwise).
+
+Both backends produce the same compact text for ordinary JSON data. They differ for
+non-finite floats: orjson writes NaN/Infinity as null, stdlib json writes NaN/Infinity
+literals. Don't rely on NaN round-tripping through these helpers.
+"""
+import json
+import re
+from typing import Any
+
+# stdlib defaults to ', ' / ': '; match orjson's compact output
+_COMPACT_SEPARATORS = (',', ':')
+
+# A \u0000 escape that isn't itself an escaped backslash followed by "u0000"
+_NUL_ESCAPE_RE = re.compile(r'(?<!\\)((?:\\\\)*)\\u0000')
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(content: Any) -> Any:
+    """Decode JSON from str or bytes."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def json_dumps(obj: Any, sort_keys: bool = False) -> str:
+    """Encode obj as a compact JSON string (sort_keys gives a canonical form)."""
+    if orjson is not None:
+        # OPT_NON_STR_KEYS: YAML specs often have int keys such as response codes
+        option = orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, option=option).decode()
+        except TypeError:
+            # e.g. integers wider than 64 bits - let stdlib json handle them
+            pass
+    return json.dumps(obj, sort_keys=sort_keys, separators=_COMPACT_SEPARATORS)
+
+
+def json_dumps_jsonb(obj: Any) -> str:
+    """
+    Encode obj like json_dumps, as text Postgres jsonb accepts.
+
+    jsonb rejects the \\u0000 escape (json columns took it), and stored results carry raw
+    response text that can contain NUL characters; those become U+FFFD.
+    """
+    text = json_dumps(obj)
+    if '\\u0000' in text:
+        text = _NUL_ESCAPE_RE.sub(r'\1\\ufffd', text)
+    return text
+
+
+def json_pretty(obj: Any) -> str:
+    """Encode obj as JSON indented by two spaces, for display."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass
+    return json.dumps(obj, indent=2)
+
+
+def json_bytes(obj: Any) -> bytes:
+    """Encode obj as compact UTF-8 JSON bytes, e.g. for an HTTP request body."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass
+    return json.dumps(obj, separators=_COMPACT_SEPARATORS).encode()
@@ -6,12 +6,18 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.serialization import json_dumps_jsonb, json_loads
 
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
     pool_size=10,
     max_overflow=20,
+    # Room for every distinct statement shape in the app, so SQL is compiled once per shape
+    query_cache_size=1200,
+    # JSON columns hold whole OpenAPI specs and result lists - use the fast codec
+    json_serializer=json_dumps_jsonb,
+    json_deserializer=json_loads,
 )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
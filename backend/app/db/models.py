@@ -1,8 +1,9 @@
 """
 Database models.
 """
-from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, Integer, String, Text, DateTime, JSON, Boolean, Index
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 import uuid
 
@@ -28,10 +29,21 @@ class Project(Base):
     user_id = Column(UUID(as_uuid=True), nullable=False, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text)
-    openapi_spec = Column(JSON, nullable=False)  # Parsed OpenAPI spec
+    # Kept as JSON (not JSONB): JSONB reorders object keys, and paths/schemas are shown in spec order.
+    # Deferred: the spec can be megabytes, so list/lookup queries don't fetch it unless
+    # accessed (or requested up front with .options(undefer(Project.openapi_spec))).
+    openapi_spec = deferred(Column(JSON, nullable=False))  # Parsed OpenAPI spec
     original_file_name = Column(String(255))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Read-only; lazy="raise" so N+1 lazy loads fail loudly - load with selectinload()
+    test_suites = relationship(
+        "TestSuite",
+        primaryjoin="Project.id == foreign(TestSuite.project_id)",
+        viewonly=True,
+        lazy="raise",
+    )
 
 
 class ProjectConfig(Base):
@@ -54,14 +66,18 @@ class ProjectConfig(Base):
 class TestSuite(Base):
     """Generated test suite."""
     __tablename__ = "test_suites"
+    __table_args__ = (
+        # "latest suites for project" - served in order straight from the index
+        Index("ix_test_suites_project_created", "project_id", "created_at"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    project_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    project_id = Column(UUID(as_uuid=True), nullable=False)
     name = Column(String(255), nullable=False)
-    test_cases = Column(JSON, nullable=False)  # Array of test cases
+    test_cases = Column(JSONB, nullable=False)  # Array of test cases
     format = Column(String(50))  # pytest, postman, etc.
     status = Column(String(50))  # generated, running, completed, failed
-    generated_endpoints = Column(JSON)  # List of endpoints that have been generated: [{"path": "...", "method": "..."}]
+    generated_endpoints = Column(JSONB)  # List of endpoints that have been generated: [{"path": "...", "method": "..."}]
     # CI status metadata for team workflows
     last_ci_status = Column(String(50))  # success, failed, running, unknown
     last_ci_provider = Column(String(100))  # github_actions, gitlab, jenkins, etc.
@@ -69,17 +85,29 @@ class TestSuite(Base):
     last_ci_url = Column(String(1000))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    
+    # Read-only; lazy="raise" so N+1 lazy loads fail loudly - load with selectinload()
+    executions = relationship(
+        "TestExecution",
+        primaryjoin="TestSuite.id == foreign(TestExecution.test_suite_id)",
+        viewonly=True,
+        lazy="raise",
+    )
 
 
 class TestExecution(Base):
     """Test execution results."""
     __tablename__ = "test_executions"
+    __table_args__ = (
+        # "executions for suite, newest first"
+        Index("ix_test_executions_suite_started", "test_suite_id", "started_at"),
+    )
     
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    test_suite_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    test_suite_id = Column(UUID(as_uuid=True), nullable=False)
     status = Column(String(50))  # running, completed, failed
-    results = Column(JSON)  # Test results
-    summary = Column(JSON)  # Summary stats
+    results = Column(JSONB)  # Test results
+    summary = Column(JSONB)  # Summary stats
     started_at = Column(DateTime(timezone=True), server_default=func.now())
     completed_at = Column(DateTime(timezone=True))
 
@@ -103,11 +131,15 @@ class IntegrationConfig(Base):
 class ActivityLog(Base):
     """Per-project activity log (audit trail)."""
     __tablename__ = "activity_logs"
+    __table_args__ = (
+        # "recent activity for project"
+        Index("ix_activity_logs_project_created", "project_id", "created_at"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    project_id = Column(UUID(as_uuid=True), nullable=False, index=True)
+    project_id = Column(UUID(as_uuid=True), nullable=False)
     actor = Column(String(255))  # e.g., user email or name
     action = Column(String(255), nullable=False)  # short action label
-    details = Column(JSON)  # structured metadata about the action
+    details = Column(JSONB)  # structured metadata about the action
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
@@ -1,14 +1,21 @@
 """
 Main FastAPI application entry point.
 """
-from fastapi import FastAPI
+import gzip
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
+from sqlalchemy import text
 
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.core.serialization import orjson
 from app.core.middleware import MonitoringMiddleware, ErrorHandlingMiddleware
 from app.api.v1.router import api_router
+from app.api.v1.endpoints.upload import close_http_client
+from app.services.activity_logger import flush_activity_log
 from app.db.database import engine, Base
 
 
@@ -17,11 +24,18 @@ async def lifespan(app: FastAPI):
     """Application lifespan events."""
     # Startup
     setup_logging()
-    # Create tables
-    Base.metadata.create_all(bind=engine)
+    if settings.AUTO_CREATE_TABLES:
+        # Create tables
+        Base.metadata.create_all(bind=engine)
+    else:
+        # Schema is managed by Alembic - just fail fast if the database is unreachable
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
     yield
     # Shutdown
-    pass
+    await close_http_client()
+    flush_activity_log()
+    engine.dispose()
 
 
 app = FastAPI(
@@ -29,11 +43,15 @@ app = FastAPI(
     description="Automated API test generation from OpenAPI/Swagger specifications",
     version="0.1.0",
     lifespan=lifespan,
+    # orjson renders large spec/report payloads much faster than stdlib json
+    default_response_class=ORJSONResponse if orjson is not None else JSONResponse,
 )
 
 # Middleware (order matters - last added is first executed)
 app.add_middleware(ErrorHandlingMiddleware)
-app.add_middleware(MonitoringMiddleware)
+if settings.ENABLE_METRICS:
+    # Skipped entirely when metrics are off, so requests pay no timing/labeling cost
+    app.add_middleware(MonitoringMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.get_cors_origins(),
@@ -59,8 +77,16 @@ async def health():
 
 
 @app.get("/metrics")
-async def metrics():
-    """Prometheus metrics endpoint."""
+async def metrics(request: Request):
+    """Prometheus metrics endpoint (gzip-compressed when the scraper accepts it)."""
     from app.core.monitoring import get_metrics
-    return Response(content=get_metrics(), media_type="text/plain")
+    body = get_metrics()
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        # Exposition text is highly repetitive; level 1 gets most of the ratio cheaply
+        return Response(
+            content=gzip.compress(body, compresslevel=1),
+            media_type="text/plain",
+            headers={"Content-Encoding": "gzip", "Vary": "Accept-Encoding"},
+        )
+    return Response(content=body, media_type="text/plain")
 
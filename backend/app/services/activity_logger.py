@@ -1,13 +1,31 @@
 """
 Simple activity logging service for per-project audit trail.
+
+Entries are queued in-process and written in batches by a background thread,
+so request handlers don't pay a commit round-trip per activity entry.
 """
-from typing import Any, Dict, Optional
+import logging
+import queue
+import threading
+import uuid
+from typing import Any, Dict, List, Optional
 from uuid import UUID
 
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from app.db.database import SessionLocal
 from app.db.models import ActivityLog
 
+logger = logging.getLogger(__name__)
+
+_FLUSH_INTERVAL_SECONDS = 0.2
+_MAX_BATCH_SIZE = 500
+
+_activity_queue: "queue.SimpleQueue[Optional[Dict[str, Any]]]" = queue.SimpleQueue()
+_writer_thread: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
 
 def log_activity(
     db: Session,
@@ -17,24 +35,79 @@ def log_activity(
     details: Optional[Dict[str, Any]] = None,
 ) -> None:
     """
-    Persist a single activity entry.
+    Queue a single activity entry for persistence (non-blocking).
 
     Args:
-        db: SQLAlchemy session
+        db: SQLAlchemy session (unused - entries are written by the background writer)
         project_id: Project UUID
         action: Short action label, e.g. "generated_tests", "deleted_endpoint_tests", "updated_config"
         actor: Optional actor identifier (email, name, or system). If not provided, defaults to "system".
         details: Optional structured metadata about the action (counts, endpoint list, etc.).
     """
-    actor_value = actor or "system"
-    entry = ActivityLog(
-        project_id=project_id,
-        actor=actor_value,
-        action=action,
-        details=details or {},
-    )
-    db.add(entry)
-    db.commit()
+    _ensure_writer()
+    _activity_queue.put({
+        "id": uuid.uuid4(),
+        "project_id": project_id,
+        "actor": actor or "system",
+        "action": action,
+        "details": details or {},
+    })
+
+
+def flush_activity_log(timeout: float = 5.0) -> None:
+    """Write any queued entries and stop the background writer (call on shutdown)."""
+    global _writer_thread
+    with _writer_lock:
+        thread = _writer_thread
+        _writer_thread = None
+    if thread is None:
+        return
+    _activity_queue.put(None)  # Sentinel: drain then exit
+    thread.join(timeout)
+
+
+def _ensure_writer() -> None:
+    """Start the background writer thread on first use."""
+    global _writer_thread
+    if _writer_thread is not None:
+        return
+    with _writer_lock:
+        if _writer_thread is None:
+            _writer_thread = threading.Thread(
+                target=_writer_loop, name="activity-log-writer", daemon=True
+            )
+            _writer_thread.start()
+
 
+def _writer_loop() -> None:
+    """Collect queued entries into batches and insert each batch with one commit."""
+    running = True
+    while running:
+        item = _activity_queue.get()
+        if item is None:
+            break
+        rows = [item]
+        # Gather whatever else arrives within the flush window, up to a batch
+        while len(rows) < _MAX_BATCH_SIZE:
+            try:
+                item = _activity_queue.get(timeout=_FLUSH_INTERVAL_SECONDS)
+            except queue.Empty:
+                break
+            if item is None:
+                running = False
+                break
+            rows.append(item)
+        _write_rows(rows)
 
 
+def _write_rows(rows: List[Dict[str, Any]]) -> None:
+    """Insert a batch of activity rows; failures are logged, never raised."""
+    db = SessionLocal()
+    try:
+        db.execute(insert(ActivityLog), rows)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Failed to write {len(rows)} activity log entries: {str(e)}")
+    finally:
+        db.close()
@@ -1,16 +1,165 @@
 """
 OpenAPI/Swagger specification parser with $ref resolution.
 """
-import json
+import hashlib
 import logging
-from typing import Dict, Any, List, Optional
+import sys
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from functools import lru_cache, reduce
+from operator import getitem
+from typing import Dict, Any, Iterator, List, Optional, Tuple
 from pathlib import Path
 
-import prance
+import yaml
 from openapi_spec_validator import validate_spec
 
+from app.core.serialization import json_dumps, json_loads
+
 logger = logging.getLogger(__name__)
 
+# Path-item keys that are operations (everything else: parameters, summary, servers, ...)
+HTTP_METHODS = frozenset({'get', 'post', 'put', 'patch', 'delete', 'head', 'options'})
+# One shared upper-case string per method instead of a fresh str per endpoint
+_UPPER_METHODS = {method: sys.intern(method.upper()) for method in HTTP_METHODS}
+
+# Resolved specs keyed by a hash of the input, least recently used first, with a flag
+# recording whether they passed validation. A cached spec is handed to every parser of
+# the same input, so resolved specs are read-only; callers that modify one copy it first.
+_PARSE_CACHE_MAX_SIZE = 64
+_PARSE_CACHE: "OrderedDict[str, Tuple[Dict[str, Any], bool]]" = OrderedDict()
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=4096)
+def _ref_parts(ref: str) -> Tuple[str, ...]:
+    """Split and unescape a local JSON pointer once; specs reuse the same refs heavily."""
+    return tuple(
+        part.replace('~1', '/').replace('~0', '~')
+        for part in ref[1:].split('/')[1:]
+    )
+
+
+def _lookup_ref(root: Any, ref: str) -> Any:
+    """Walk a local JSON pointer ('#/components/schemas/User') from root."""
+    if not ref.startswith('#'):
+        # External ref - would need to fetch
+        raise ValueError(f"External references not supported: {ref}")
+    
+    parts = _ref_parts(ref)
+    try:
+        # Common case (dict keys only): the walk runs in C
+        return reduce(getitem, parts, root)
+    except (KeyError, IndexError, TypeError):
+        pass
+    
+    # Pointers through arrays need integer indices
+    current = root
+    for part in parts:
+        try:
+            current = current[int(part)] if isinstance(current, list) else current[part]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ValueError(f"Reference not found: {ref}")
+    
+    return current
+
+
+def _resolve_refs(node: Any, root: Any, seen: set, memo: Dict[int, Any]) -> Any:
+    """
+    Return a copy of node with every local $ref replaced by its target, in one pass.
+    
+    Each subtree of root is resolved once and shared by every reference to it
+    (memo is keyed by id()). A $ref pointing back into a subtree that is still
+    being resolved (id() in seen) is recursive and is left as a $ref. The result
+    shares no dicts or lists with node.
+    """
+    if isinstance(node, dict):
+        ref = node.get('$ref')
+        if isinstance(ref, str) and ref.startswith('#'):
+            target = _lookup_ref(root, ref)
+            if id(node) in seen or id(target) in seen:
+                return dict(node)
+            seen.add(id(node))
+            try:
+                return _resolve_refs(target, root, seen, memo)
+            finally:
+                seen.discard(id(node))
+        
+        key = id(node)
+        if key in memo:
+            return memo[key]
+        seen.add(key)
+        resolved = {k: _resolve_refs(v, root, seen, memo) for k, v in node.items()}
+        seen.discard(key)
+        memo[key] = resolved
+        return resolved
+    
+    if isinstance(node, list):
+        key = id(node)
+        if key in memo:
+            return memo[key]
+        seen.add(key)
+        resolved = [_resolve_refs(item, root, seen, memo) for item in node]
+        seen.discard(key)
+        memo[key] = resolved
+        return resolved
+    
+    return node
+
+
+class Endpoint(Mapping):
+    """
+    Read-only view of one operation in the spec.
+    
+    Behaves like the endpoint dicts the parser used to build (endpoint['path'],
+    endpoint.get('parameters', [])), but only stores path, method, the operation
+    and its effective parameters; the other fields are read from the operation on access.
+    """
+    
+    __slots__ = ('path', 'method', 'operation', 'parameters')
+    
+    _KEYS = ('path', 'method', 'operation', 'operation_id', 'summary',
+             'parameters', 'request_body', 'responses')
+    
+    def __init__(self, path: str, method: str, operation: Dict[str, Any],
+                 parameters: Optional[List[Dict[str, Any]]] = None):
+        self.path = path
+        self.method = method
+        self.operation = operation
+        # Path-item + operation parameters, already merged by the parser
+        self.parameters = operation.get('parameters', []) if parameters is None else parameters
+    
+    @property
+    def operation_id(self) -> str:
+        return self.operation.get('operationId', f"{self.method}_{self.path}")
+    
+    @property
+    def summary(self) -> str:
+        return self.operation.get('summary', '')
+    
+    @property
+    def request_body(self) -> Dict[str, Any]:
+        return self.operation.get('requestBody', {})
+    
+    @property
+    def responses(self) -> Dict[str, Any]:
+        return self.operation.get('responses', {})
+    
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._KEYS)
+    
+    def __len__(self) -> int:
+        return len(self._KEYS)
+    
+    def __repr__(self) -> str:
+        return f"Endpoint({self.method} {self.path})"
+
 
 class OpenAPIParser:
     """Parser for OpenAPI specifications with $ref resolution."""
@@ -27,40 +176,79 @@ class OpenAPIParser:
         self.spec_dict = spec_dict
         self.resolved_spec: Optional[Dict] = None
         self.collections: Dict[str, Any] = {}
+        self.schema_count = 0
+        self._ref_cache: Dict[str, Any] = {}
+        self._param_cache: Dict[int, List[Dict[str, Any]]] = {}
     
-    def parse(self) -> Dict[str, Any]:
+    def parse(self, validate: bool = False) -> Dict[str, Any]:
         """
         Parse and resolve OpenAPI specification.
         
+        Results are cached by input content, so parsing the same spec again
+        (re-generation, project views) skips resolution and validation. The
+        returned spec may be shared with other parsers: don't modify it in place.
+        
+        Args:
+            validate: Validate against the OpenAPI meta-schema. Only needed when a
+                spec enters the system (upload/import); stored specs were validated then.
+        
         Returns:
             Resolved OpenAPI specification
         """
         try:
+            self._ref_cache = {}
+            self._param_cache = {}
+            
+            # Read a spec file once; the same bytes are hashed and parsed
+            content = Path(self.spec_path).read_bytes() if self.spec_path else None
+            cache_key = self._cache_key(content)
+            if cache_key is not None:
+                with _PARSE_CACHE_LOCK:
+                    cached = _PARSE_CACHE.get(cache_key)
+                    if cached is not None:
+                        _PARSE_CACHE.move_to_end(cache_key)
+                if cached is not None:
+                    cached_spec, validated = cached
+                    self.resolved_spec = cached_spec
+                    if validate and not validated:
+                        self._validate()
+                        self._store_in_cache(cache_key, cached_spec, validated=True)
+                    self._extract_collections()
+                    return self.resolved_spec
+            
             # Load spec
-            if self.spec_path:
-                parser = prance.ResolvingParser(self.spec_path)
+            if content is not None:
+                if str(self.spec_path).endswith(('.yaml', '.yml')):
+                    spec = yaml.safe_load(content)
+                else:
+                    spec = json_loads(content)
+                # A file with no $ref at all (e.g. already resolved by a CI step) needs no walk
+                needs_resolution = b'$ref' in content
             elif self.spec_dict:
-                # Write to temp file for prance
-                import tempfile
-                with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-                    json.dump(self.spec_dict, f)
-                    temp_path = f.name
-                
-                parser = prance.ResolvingParser(temp_path)
-                Path(temp_path).unlink()  # Clean up
+                # Resolve the dict directly - no serialize/temp-file/re-parse round trip
+                spec = self.spec_dict
+                needs_resolution = True
             else:
                 raise ValueError("Either spec_path or spec_dict must be provided")
             
-            # Get resolved spec
-            self.resolved_spec = parser.specification
+            # Resolve local $refs in a single pass (recursive refs stay as $ref)
+            if needs_resolution:
+                self.resolved_spec = _resolve_refs(spec, spec, set(), {})
+            else:
+                self.resolved_spec = spec
             
-            # Validate
-            validate_spec(self.resolved_spec)
+            if validate:
+                self._validate()
             
             # Extract collections (reusable schemas)
             self._extract_collections()
             
-            logger.info(f"Successfully parsed OpenAPI spec with {len(self.collections)} collections")
+            if cache_key is not None:
+                # Safe to share: it was loaded from the file here or resolved into new
+                # dicts/lists, so the caller's spec_dict holds no part of it
+                self._store_in_cache(cache_key, self.resolved_spec, validated=validate)
+            
+            logger.info(f"Successfully parsed OpenAPI spec with {self.schema_count} collections")
             
             return self.resolved_spec
         
@@ -68,6 +256,35 @@ class OpenAPIParser:
             logger.error(f"Error parsing OpenAPI spec: {str(e)}")
             raise
     
+    def _validate(self) -> None:
+        """
+        Validate the resolved spec against the OpenAPI meta-schema.
+        
+        Whether a spec already passed is tracked in the in-process parse cache only.
+        """
+        validate_spec(self.resolved_spec)
+    
+    def _store_in_cache(self, cache_key: str, spec: Dict[str, Any], validated: bool) -> None:
+        """Record a resolved spec in the parse cache, evicting the least recently used."""
+        with _PARSE_CACHE_LOCK:
+            _PARSE_CACHE[cache_key] = (spec, validated)
+            _PARSE_CACHE.move_to_end(cache_key)
+            while len(_PARSE_CACHE) > _PARSE_CACHE_MAX_SIZE:
+                _PARSE_CACHE.popitem(last=False)
+    
+    def _cache_key(self, content: Optional[bytes] = None) -> Optional[str]:
+        """Hash the input spec (file bytes or canonical JSON of spec_dict); None if not hashable."""
+        try:
+            if content is not None:
+                data = content
+            elif self.spec_dict:
+                data = json_dumps(self.spec_dict, sort_keys=True).encode()
+            else:
+                return None
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+    
     def _extract_collections(self):
         """Extract reusable schema collections from components/schemas."""
         if not self.resolved_spec:
@@ -80,35 +297,73 @@ class OpenAPIParser:
         # Swagger 2.0
         elif 'definitions' in self.resolved_spec:
             self.collections = self.resolved_spec['definitions']
+        
+        self.schema_count = len(self.collections)
     
-    def get_endpoints(self) -> List[Dict[str, Any]]:
+    def get_endpoints(self) -> List[Endpoint]:
         """
         Extract all API endpoints from the spec.
         
         Returns:
-            List of endpoint definitions
+            List of endpoint definitions (read-only mappings)
+        """
+        return list(self.iter_endpoints())
+    
+    def iter_endpoints(self) -> Iterator[Endpoint]:
+        """
+        Lazily yield API endpoint definitions (same items as get_endpoints()).
+        
+        Useful when only the first few endpoints are needed, e.g. previews.
         """
         if not self.resolved_spec:
             raise ValueError("Spec not parsed. Call parse() first.")
         
-        endpoints = []
         paths = self.resolved_spec.get('paths', {})
         
         for path, path_item in paths.items():
+            # Path-level parameters apply to every operation under the path
+            path_params = path_item.get('parameters') or []
             for method, operation in path_item.items():
-                if method in ['get', 'post', 'put', 'patch', 'delete', 'head', 'options']:
-                    endpoints.append({
-                        'path': path,
-                        'method': method.upper(),
-                        'operation': operation,
-                        'operation_id': operation.get('operationId', f"{method.upper()}_{path}"),
-                        'summary': operation.get('summary', ''),
-                        'parameters': operation.get('parameters', []),
-                        'request_body': operation.get('requestBody', {}),
-                        'responses': operation.get('responses', {}),
-                    })
-        
-        return endpoints
+                if method in HTTP_METHODS:
+                    yield Endpoint(
+                        path,
+                        _UPPER_METHODS[method],
+                        operation,
+                        self._merge_parameters(path_params, operation),
+                    )
+    
+    def _merge_parameters(self, path_params: List[Dict[str, Any]], operation: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Merge path-level parameters into an operation's, once per operation.
+        
+        Operation parameters override path-level ones with the same (name, in).
+        """
+        op_params = operation.get('parameters', [])
+        if not path_params:
+            return op_params
+        
+        merged = self._param_cache.get(id(operation))
+        if merged is None:
+            by_key = {}
+            for param in (*path_params, *op_params):
+                if isinstance(param, dict) and 'name' in param:
+                    by_key[(param['name'], param.get('in'))] = param
+                else:
+                    by_key[id(param)] = param  # e.g. unresolved $ref - keep as-is
+            merged = self._param_cache[id(operation)] = list(by_key.values())
+        return merged
+    
+    def count_endpoints(self) -> int:
+        """Count API endpoints without building endpoint definitions."""
+        if not self.resolved_spec:
+            raise ValueError("Spec not parsed. Call parse() first.")
+        
+        return sum(
+            1
+            for path_item in self.resolved_spec.get('paths', {}).values()
+            for method in path_item
+            if method in HTTP_METHODS
+        )
     
     def get_schemas(self) -> Dict[str, Any]:
         """Get all schemas/collections."""
@@ -122,22 +377,12 @@ class OpenAPIParser:
             ref: Reference string (e.g., '#/components/schemas/User')
         
         Returns:
-            Resolved schema
+            Resolved schema (memoized per parser, so repeated refs are a dict lookup)
         """
-        if not ref.startswith('#'):
-            # External ref - would need to fetch
-            raise ValueError(f"External references not supported: {ref}")
-        
-        parts = ref.split('/')[1:]  # Remove '#'
-        current = self.resolved_spec
-        
-        for part in parts:
-            if part in current:
-                current = current[part]
-            else:
-                raise ValueError(f"Reference not found: {ref}")
-        
-        return current
+        resolved = self._ref_cache.get(ref)
+        if resolved is None:
+            resolved = self._ref_cache[ref] = _lookup_ref(self.resolved_spec, ref)
+        return resolved
 
 
 
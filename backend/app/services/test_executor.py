@@ -1,14 +1,321 @@
 """
 Test execution engine.
 """
+import ast
+import hashlib
+import itertools
 import json
 import logging
+import random
+import re
+import sys
+import threading
+import time
 import requests
-from typing import Dict, Any, List, Optional
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from requests.compat import chardet
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.retry import Retry
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
+from enum import IntFlag
+
+from app.core.serialization import json_bytes, json_dumps, json_loads, json_pretty
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on flow steps / tests sent at once (independent reads only)
+_MAX_CONCURRENT_STEPS = 8
+
+# Response cache for GET tests that opt in with "cacheable": true
+_RESPONSE_CACHE_SIZE = 256
+_RESPONSE_CACHE_TTL_SECONDS = 60.0
+
+# Path template parameters such as {petId}
+_PATH_PARAM_RE = re.compile(r'\{(\w+)\}')
+# ID fields copied from responses into the context, and the context keys (lowercased
+# forms of the same fields) tried for a path parameter with no exact context match
+_RESPONSE_ID_FIELDS = ('id', 'petId', 'orderId', 'userId', 'pet_id', 'order_id', 'user_id')
+_FALLBACK_ID_KEYS = tuple(field.lower() for field in _RESPONSE_ID_FIELDS)
+# Other response fields worth keeping in the context (already lowercase)
+_RESPONSE_VALUE_FIELDS = ('username', 'name', 'email', 'token', 'access_token')
+# Minimal valid PUT bodies used when a test has no payload, by endpoint substring (first
+# match wins). Shared across tests - treat as read-only.
+_DEFAULT_PUT_PAYLOADS = (
+    ('/pet', {
+        'id': 1,
+        'name': 'Updated Pet',
+        'status': 'available',
+        'category': {'id': 1, 'name': 'Dogs'},
+        'tags': [{'id': 1, 'name': 'friendly'}],
+        'photoUrls': ['https://example.com/photo.jpg']
+    }),
+    ('/user', {
+        'id': 1,
+        'username': 'updateduser',
+        'firstName': 'Updated',
+        'lastName': 'User',
+        'email': 'updated@example.com',
+        'password': 'password123',
+        'phone': '1234567890',
+        'userStatus': 1
+    }),
+)
+
+# Endpoint / test name keywords, each set matched in a single regex pass
+_FILE_ENDPOINT_RE = re.compile(r'upload|image|file', re.IGNORECASE)
+_UPLOAD_ENDPOINT_RE = re.compile(r'upload|image', re.IGNORECASE)
+_INVALID_INPUT_NAME_RE = re.compile(r'negative|security|missing required')
+_NEGATIVE_NAME_RE = re.compile(r'negative|security|validation')
+
+
+class _TestKind(IntFlag):
+    """What a test's name/type say it exercises (drives request shaping and status rules)."""
+    INVALID_INPUT = 1   # name: negative / security / missing required (skip sample file upload)
+    EMPTY_BOUNDARY = 2  # name: boundary with empty or negative values (skip sample file upload)
+    NEGATIVE = 4        # name or type: negative / security / validation (expects rejection)
+    BOUNDARY = 8        # name or type: boundary
+    PERFORMANCE = 16    # name or type: performance
+
+
+def _classify_test(test_case: Dict[str, Any]) -> _TestKind:
+    """Classify a test from its name and type in one pass over the lowercased strings."""
+    name = test_case.get('name', '').lower()
+    test_type = test_case.get('type', '').lower()
+    kind = _TestKind(0)
+    if _INVALID_INPUT_NAME_RE.search(name):
+        kind |= _TestKind.INVALID_INPUT
+    if 'boundary' in name and ('empty' in name or 'negative' in name):
+        kind |= _TestKind.EMPTY_BOUNDARY
+    if _NEGATIVE_NAME_RE.search(name) or test_type in ('negative', 'security', 'validation'):
+        kind |= _TestKind.NEGATIVE
+    if 'boundary' in name or test_type == 'boundary':
+        kind |= _TestKind.BOUNDARY
+    if 'performance' in name or test_type == 'performance':
+        kind |= _TestKind.PERFORMANCE
+    return kind
+
+
+# Methods whose payload goes into the query string
+_QUERY_ONLY_METHODS = frozenset(('GET', 'DELETE'))
+# Status codes accepted per test kind: negative/security tests pass on any rejection;
+# performance/boundary tests pass on success or a payload rejection
+_REJECTION_STATUSES = frozenset((400, 422, 403, 404, 415, 500))
+_REJECTED_PAYLOAD_STATUSES = frozenset((400, 422, 500))
+_ACCEPT_OR_REJECT_STATUSES = frozenset((200, 201)) | _REJECTED_PAYLOAD_STATUSES
+# Placeholder shown for responses without a body
+_EMPTY_BODY = "(empty response body)"
+_BODY_NOT_CAPTURED = "(response body not captured)"
+# Marks a response body that execute_test did not parse as JSON
+_UNPARSED = object()
+# Multi-step test types handled by _execute_special_test
+_SPECIAL_TEST_TYPES = frozenset(('integration', 'crud', 'e2e'))
+# Parameter name fragments that get a generated numeric value
+_ID_LIKE_WORDS = ('id', 'num', 'code', 'ref')
+# ID parameters that a CRUD flow fills with the ID returned by its create step
+_CREATED_ID_PARAM_RE = re.compile(r'\{(?:id|petId|orderId|userId)\}')
+
+
+# Interned HTTP method names, so a normalized method can be matched by identity
+_METHODS = {method: sys.intern(method) for method in ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')}
+_GET = _METHODS['GET']
+
+
+def _step_method(step: Dict[str, Any], default: str = 'GET') -> str:
+    """Upper-cased HTTP method of a test case or flow step (interned when it is a known one)."""
+    method = step.get('method', default).upper()
+    return _METHODS.get(method, method)
+
+
+@lru_cache(maxsize=256)
+def _split_path_template(endpoint: str) -> Tuple[str, ...]:
+    """Split a path template into literal segments (even indexes) and parameter names (odd).
+    
+    Flows reuse a small set of endpoint templates, so each is only scanned once.
+    """
+    return tuple(_PATH_PARAM_RE.split(endpoint))
+
+
+@lru_cache(maxsize=512)
+def _json_path_keys(path: str) -> Tuple[Tuple[str, Optional[int]], ...]:
+    """Split a dot-notation assertion path into (key, list index or None) pairs, once per path."""
+    keys = []
+    for key in path.split('.'):
+        try:
+            index = int(key)
+        except ValueError:
+            index = None
+        keys.append((key, index))
+    return tuple(keys)
+
+
+@lru_cache(maxsize=256)
+def _compiled_pattern(pattern: str) -> re.Pattern:
+    """Compile an assertion's 'matches' pattern once per distinct pattern."""
+    return re.compile(pattern)
+
+
+def _as_number(value: Any) -> float:
+    """
+    Numeric value for comparisons: float(value), skipping the call for values that
+    already are floats. Ints still go through float(), as before, so very large ints
+    compare after the same rounding.
+    """
+    if type(value) is float:
+        return value
+    return float(value)
+
+# Assertion conditions: name -> check(actual, expected)
+_CONDITION_CHECKS: Dict[str, Callable[[Any, Any], bool]] = {
+    'equals': lambda actual, expected: actual == expected,
+    'not_equals': lambda actual, expected: actual != expected,
+    'contains': lambda actual, expected: str(expected) in str(actual),
+    'not_contains': lambda actual, expected: str(expected) not in str(actual),
+    'greater_than': lambda actual, expected: _as_number(actual) > _as_number(expected),
+    'less_than': lambda actual, expected: _as_number(actual) < _as_number(expected),
+    'matches': lambda actual, expected: bool(_compiled_pattern(str(expected)).search(str(actual))),
+    'exists': lambda actual, expected: actual is not None and actual != '',
+    'not_exists': lambda actual, expected: actual is None or actual == '',
+}
+
+
+def _utcnow_iso() -> str:
+    """Current UTC time as a naive ISO-8601 string (the format stored in results)."""
+    return datetime.utcnow().isoformat()
+
+
+def _random_suffix() -> str:
+    """Six random lowercase hex characters for generated names."""
+    return f'{random.getrandbits(24):06x}'
+
+# One connection pool shared by every executor's session. Executors are created per
+# request/run, so a per-instance pool would redo TCP/TLS handshakes against the same
+# API each time. Headers, auth and cookies stay per-session; only sockets are shared.
+# Sized for several concurrent runs each sending up to _MAX_CONCURRENT_STEPS requests to
+# one host; only failed connection attempts are retried, never a sent request.
+_SHARED_ADAPTER = HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, connect=2, read=0, status=0, other=0, backoff_factor=0.1, raise_on_status=False),
+)
+
+
+def _send_multipart(session: requests.Session, url: str, payload: Dict[str, Any]) -> requests.Response:
+    """POST a placeholder image as multipart/form-data alongside the other payload fields."""
+    files = {'file': ('test.jpg', b'fake image content', 'image/jpeg')}
+    data = {k: v for k, v in payload.items() if k != 'file'}
+    return session.post(url, files=files, data=data, timeout=30)
+
+
+_JSON_HEADERS = {'Content-Type': 'application/json'}
+
+
+def _send_json(session: requests.Session, method: str, url: str, payload: Any) -> requests.Response:
+    """Send payload as a JSON body, encoded with orjson when available (like ``json=``)."""
+    # Like requests' json=, don't override a Content-Type configured on the session
+    headers = None if 'Content-Type' in session.headers else _JSON_HEADERS
+    return session.request(method, url, data=json_bytes(payload), headers=headers, timeout=30)
+
+
+# How each flow step method is sent; POSTs to upload endpoints use _send_multipart instead
+_FLOW_SENDERS: Dict[str, Callable[[requests.Session, str, Dict[str, Any]], requests.Response]] = {
+    'GET': lambda session, url, payload: session.get(url, params=payload, timeout=30),
+    'POST': lambda session, url, payload: _send_json(session, 'POST', url, payload),
+    'PUT': lambda session, url, payload: _send_json(session, 'PUT', url, payload),
+    'DELETE': lambda session, url, payload: session.delete(url, timeout=30),
+}
+
+
+def _decode_body(data: bytes, encoding: Optional[str]) -> str:
+    """Decode like ``Response.text``: detect the charset when none was declared."""
+    if not encoding:
+        encoding = chardet.detect(data)['encoding'] or 'utf-8'
+    try:
+        return data.decode(encoding, errors='replace')
+    except LookupError:
+        # Content-Type named a charset Python doesn't know
+        return data.decode('utf-8', errors='replace')
+
+
+def _body_preview(response: requests.Response, limit: int = 2000) -> Tuple[Optional[str], bool]:
+    """Decode at most ``limit`` characters of a response body: (text, whether it was cut).
+
+    ``response.text`` decodes the whole body (and may run charset detection over it)
+    before we slice it, so only decode the prefix that can fit in ``limit`` characters.
+    """
+    try:
+        content = response.content
+        head = content[:limit * 4]  # A UTF-8 character is at most 4 bytes
+        text = _decode_body(head, response.encoding)
+        return text[:limit], len(text) > limit or len(content) > len(head)
+    except Exception:
+        return None, False
+
+
+def _truncated_body(response: requests.Response, limit: int = 2000) -> Optional[str]:
+    """Decode at most ``limit`` characters of a response body for traces."""
+    return _body_preview(response, limit)[0]
+
+
+class _ResponseSnapshot:
+    """
+    Status, headers and body of a cached GET response.
+    
+    Offers the parts of requests.Response that test execution reads, without keeping
+    the live response (raw stream, connection, request) alive in the cache.
+    """
+    
+    __slots__ = ('status_code', 'headers', 'content', 'encoding')
+    
+    def __init__(self, response: requests.Response):
+        self.status_code = response.status_code
+        self.headers = CaseInsensitiveDict(response.headers)
+        self.content = response.content
+        self.encoding = response.encoding
+    
+    @property
+    def text(self) -> str:
+        return _decode_body(self.content, self.encoding)
+
+
+# OAuth2 access tokens shared by all executors, keyed by a hash of the client
+# credentials: token -> expiry (already reduced by the safety buffer)
+_OAUTH2_TOKENS: Dict[str, Tuple[str, datetime]] = {}
+_OAUTH2_TOKENS_LOCK = threading.Lock()
+
+
+def _decrypt_credentials(encrypted: str) -> Dict[str, Any]:
+    """
+    Decrypt and decode stored auth credentials.
+    
+    Not cached: plaintext credentials should live only as long as the executor that
+    uses them (one per run), not in a process-wide cache across projects and rotations.
+    """
+    from app.core.security import decrypt_data
+    
+    creds = decrypt_data(encrypted)
+    try:
+        return json.loads(creds)
+    except json.JSONDecodeError:
+        # Older credentials were stored as Python dict reprs
+        return ast.literal_eval(creds)
+
+
+def _new_session() -> requests.Session:
+    """Create a session that uses the shared connection pool."""
+    session = requests.Session()
+    session.mount('http://', _SHARED_ADAPTER)
+    session.mount('https://', _SHARED_ADAPTER)
+    return session
+
+
+# Token requests get their own session (no test auth headers or cookies), still on the
+# shared pool so refreshes reuse kept-alive connections to the token endpoint
+_TOKEN_SESSION = _new_session()
+
 
 class TestExecutor:
     """Execute generated test cases."""
@@ -17,7 +324,9 @@ class TestExecutor:
         self,
         base_url: str,
         auth_type: Optional[str] = None,
-        auth_credentials: Optional[str] = None
+        auth_credentials: Optional[str] = None,
+        collect_traces: bool = True,
+        capture_response_bodies: bool = True
     ):
         """
         Initialize test executor.
@@ -26,16 +335,34 @@ class TestExecutor:
             base_url: Base URL for API
             auth_type: Authentication type (basic, bearer, api_key, oauth2)
             auth_credentials: Encrypted credentials (will be decrypted)
+            collect_traces: Record request/response traces in results (skip for bulk runs
+                whose traces are never read)
+            capture_response_bodies: Decode and store response bodies even for tests with no
+                response_body assertion (skip for status-only smoke runs)
         """
         self.base_url = base_url.rstrip('/')
         self.auth_type = auth_type
         self.auth_credentials = auth_credentials
-        self.session = requests.Session()
+        self.collect_traces = collect_traces
+        self.capture_response_bodies = capture_response_bodies
+        self.session = _new_session()
         self.oauth2_creds = None
         self.oauth2_token = None
         self.oauth2_token_expires_at = None
+        # One token refresh at a time; concurrent suite tests share this executor's session
+        self._oauth2_lock = threading.Lock()
+        # Trace snapshot of self.session.headers; reset whenever auth changes them
+        self._request_headers_snapshot: Optional[Dict[str, Any]] = None
         # Context for storing dynamic values from responses
         self.context = {}
+        # Per-thread list that collects extracted context values instead of applying them
+        # (set while a test runs concurrently, see execute_test_suite)
+        self._deferred = threading.local()
+        # Responses of GET tests marked cacheable: (url, params) -> (fetched at, snapshot)
+        self._response_cache: "OrderedDict[Tuple[str, str], Tuple[float, _ResponseSnapshot]]" = OrderedDict()
+        self._response_cache_lock = threading.Lock()
+        # Generated numeric IDs: timestamp-seeded, then incremented per path (always > 0)
+        self._id_counter = itertools.count(time.time_ns() // 1_000_000 % 1000000 + 1)
         self._setup_auth()
         # limit headers stored in traces to avoid huge payloads
         self._trace_header_limit = 25
@@ -43,111 +370,231 @@ class TestExecutor:
     def _snapshot_headers(self, headers: Dict[str, Any]) -> Dict[str, Any]:
         """Trim and serialize headers for traces."""
         try:
-            items = list(headers.items()) if hasattr(headers, "items") else []
-            return dict(items[: self._trace_header_limit])
+            if not hasattr(headers, "items"):
+                return {}
+            if len(headers) <= self._trace_header_limit:
+                # Usual case: nothing to trim, copy in one go
+                return dict(headers.items())
+            return dict(itertools.islice(headers.items(), self._trace_header_limit))
         except Exception:
             return {}
     
+    def _cached_get(self, url: str, query_params: Dict[str, Any], request_kwargs: Dict[str, Any]) -> _ResponseSnapshot:
+        """GET through the per-executor response cache (LRU with a short TTL)."""
+        key = (url, json_dumps(query_params, sort_keys=True))
+        now = time.monotonic()
+        with self._response_cache_lock:
+            cached = self._response_cache.get(key)
+            if cached and now - cached[0] < _RESPONSE_CACHE_TTL_SECONDS:
+                self._response_cache.move_to_end(key)
+                return cached[1]
+        response = _ResponseSnapshot(self.session.request('GET', url, **request_kwargs))
+        with self._response_cache_lock:
+            self._response_cache[key] = (now, response)
+            self._response_cache.move_to_end(key)
+            while len(self._response_cache) > _RESPONSE_CACHE_SIZE:
+                self._response_cache.popitem(last=False)
+        return response
+    
+    def _session_headers_snapshot(self) -> Dict[str, Any]:
+        """Snapshot of the session's request headers, reused across steps until auth updates them."""
+        if self._request_headers_snapshot is None:
+            self._request_headers_snapshot = self._snapshot_headers(self.session.headers)
+        return self._request_headers_snapshot
+    
     def _replace_path_parameters(self, endpoint: str, payload: Dict[str, Any]) -> str:
         """Replace path parameters like {petId} with sample values from context, payload, or defaults."""
-        import re
-        import random
-        import string
-        from datetime import datetime
+        if '{' not in endpoint:
+            # Most steps have no path parameters
+            return endpoint
+        parts = _split_path_template(endpoint)
+        if len(parts) == 1:
+            return endpoint
+        values: Dict[str, str] = {}
+        generated_id = str(next(self._id_counter))
         
-        # Find all path parameters
-        params = re.findall(r'\{(\w+)\}', endpoint)
+        pieces = list(parts)
+        for i in range(1, len(parts), 2):
+            # A parameter repeated in the path gets the same value everywhere
+            param = parts[i]
+            if param not in values:
+                values[param] = self._path_parameter_value(param, payload, generated_id)
+            pieces[i] = values[param]
+        return ''.join(pieces)
+    
+    def _path_parameter_value(self, param: str, payload: Dict[str, Any], generated_id: str) -> str:
+        """Pick a value for one path parameter: context first, then payload, then a generated one."""
+        value = None
         
-        for param in params:
-            value = None
-            
-            # Priority 1: Try to get value from context (stored from previous responses)
-            context_key = param.lower()
-            if context_key in self.context:
-                value = str(self.context[context_key])
+        # Priority 1: Try to get value from context (stored from previous responses)
+        context_key = param.lower()
+        if context_key in self.context:
+            value = str(self.context[context_key])
+        else:
+            # Try common ID variations in context
+            for key in _FALLBACK_ID_KEYS:
+                if key in self.context:
+                    value = str(self.context[key])
+                    break
+        
+        # Priority 2: Try to get value from payload
+        if not value and param in payload:
+            payload_value = payload.pop(param)  # Remove from payload as it goes in path
+            # Only use if it's not None and not empty
+            if payload_value is not None and payload_value != '':
+                # For negative/security tests, allow "invalid_value" to pass through
+                # This is intentional to test API validation
+                if isinstance(payload_value, str) and payload_value == 'invalid_value':
+                    value = payload_value  # Keep as-is for negative tests
+                else:
+                    value = str(payload_value)
+        
+        # Priority 3: Generate dynamic values based on parameter name
+        if not value:
+            param_lower = param.lower()
+            if 'id' in param_lower:  # also covers petid, orderid, userid
+                # Generate a dynamic numeric ID (timestamp-based)
+                # Use positive integer to avoid NumberFormatException
+                value = generated_id
+            elif 'username' in param_lower or 'name' in param_lower:
+                # Generate dynamic username
+                random_suffix = _random_suffix()
+                value = f'testuser_{random_suffix}'
+            elif 'status' in param_lower:
+                value = 'available'
+            elif 'email' in param_lower:
+                random_suffix = _random_suffix()
+                value = f'test_{random_suffix}@example.com'
             else:
-                # Try common ID variations in context
-                for key in ['id', 'petid', 'orderid', 'userid', 'pet_id', 'order_id', 'user_id']:
-                    if key in self.context:
-                        value = str(self.context[key])
-                        break
-            
-            # Priority 2: Try to get value from payload
-            if not value and param in payload:
-                payload_value = payload.pop(param)  # Remove from payload as it goes in path
-                # Only use if it's not None and not empty
-                if payload_value is not None and payload_value != '':
-                    # For negative/security tests, allow "invalid_value" to pass through
-                    # This is intentional to test API validation
-                    if isinstance(payload_value, str) and payload_value == 'invalid_value':
-                        value = payload_value  # Keep as-is for negative tests
-                    else:
-                        value = str(payload_value)
-            
-            # Priority 3: Generate dynamic values based on parameter name
-            if not value:
-                param_lower = param.lower()
-                if 'id' in param_lower or 'petid' in param_lower or 'orderid' in param_lower or 'userid' in param_lower:
-                    # Generate a dynamic numeric ID (timestamp-based)
-                    # Use positive integer to avoid NumberFormatException
-                    value = str(abs(int(datetime.utcnow().timestamp() * 1000) % 1000000) + 1)  # Ensure > 0
-                elif 'username' in param_lower or 'name' in param_lower:
-                    # Generate dynamic username
-                    random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
-                    value = f'testuser_{random_suffix}'
-                elif 'status' in param_lower:
-                    value = 'available'
-                elif 'email' in param_lower:
-                    random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
-                    value = f'test_{random_suffix}@example.com'
+                # Default: use numeric timestamp-based value for IDs, string for others
+                # Check if it looks like an ID parameter
+                if any(id_word in param_lower for id_word in _ID_LIKE_WORDS):
+                    value = generated_id
                 else:
-                    # Default: use numeric timestamp-based value for IDs, string for others
-                    # Check if it looks like an ID parameter
-                    if any(id_word in param_lower for id_word in ['id', 'num', 'code', 'ref']):
-                        value = str(abs(int(datetime.utcnow().timestamp() * 1000) % 1000000) + 1)
-                    else:
-                        # For non-ID parameters, use a safe string value
-                        random_suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=6))
-                        value = f'value_{random_suffix}'
-            
-            endpoint = endpoint.replace(f'{{{param}}}', value)
+                    # For non-ID parameters, use a safe string value
+                    random_suffix = _random_suffix()
+                    value = f'value_{random_suffix}'
         
-        return endpoint
+        return value
     
     def _extract_and_store_response_values(self, response, endpoint: str, method: str):
         """Extract values from API response and store in context for use in dependent tests."""
+        values = self._extract_response_values(response, endpoint)
+        if not values:
+            return
+        pending = getattr(self._deferred, 'extractions', None)
+        if pending is not None:
+            # Running concurrently: the caller applies these in suite order
+            pending.append(values)
+        else:
+            self.context.update(values)
+    
+    def _extract_response_values(self, response, endpoint: str) -> Dict[str, str]:
+        """Context values carried by a successful JSON object response (parsing only, no writes)."""
+        values: Dict[str, str] = {}
         try:
             if response.status_code >= 200 and response.status_code < 300:
+                content = response.content
+                # Only JSON objects carry values to extract; don't decode large lists or text
+                if not content or not content[:64].lstrip().startswith(b'{'):
+                    return values
                 # Try to parse JSON response
                 try:
-                    response_data = response.json()
+                    response_data = json_loads(content)
                     if isinstance(response_data, dict):
                         # Extract common ID fields
-                        for id_field in ['id', 'petId', 'orderId', 'userId', 'pet_id', 'order_id', 'user_id']:
+                        for id_field in _RESPONSE_ID_FIELDS:
                             if id_field in response_data:
                                 value = response_data[id_field]
                                 if value is not None:
                                     # Store in multiple formats for flexibility
-                                    self.context[id_field.lower()] = str(value)
-                                    self.context[id_field] = str(value)
+                                    value = str(value)
+                                    values[id_field.lower()] = value
+                                    values[id_field] = value
                         
                         # Extract other common fields
-                        for field in ['username', 'name', 'email', 'token', 'access_token']:
-                            if field in response_data and response_data[field]:
-                                self.context[field.lower()] = str(response_data[field])
+                        for field in _RESPONSE_VALUE_FIELDS:
+                            value = response_data.get(field)
+                            if value:
+                                values[field] = str(value)
                         
                         # If response is a single object with an ID, store it generically
                         if 'id' in response_data:
                             # Store endpoint-specific ID
                             endpoint_key = endpoint.split('/')[-1].replace('{', '').replace('}', '')
                             if endpoint_key:
-                                self.context[f'{endpoint_key}_id'] = str(response_data['id'])
+                                values[f'{endpoint_key}_id'] = str(response_data['id'])
                 
                 except (ValueError, AttributeError):
                     # Not JSON, skip extraction
                     pass
         except Exception as e:
             logger.debug(f"Failed to extract response values: {str(e)}")
+        return values
+    
+    @staticmethod
+    def _is_independent_read(flow_item: Dict[str, Any]) -> bool:
+        """A GET step with no path parameters: it neither changes server state nor reads the context."""
+        return _step_method(flow_item) is _GET and '{' not in flow_item.get('endpoint', '')
+    
+    def _prefetch_independent_reads(self, flow_items: List[Dict[str, Any]], start: int) -> Dict[int, Future]:
+        """Send the run of independent reads starting at ``start`` concurrently.
+        
+        Returns finished futures keyed by flow index (empty unless the run has at least
+        two steps); callers consume them in flow order so results and context updates
+        stay sequential.
+        """
+        end = start
+        while end < len(flow_items) and self._is_independent_read(flow_items[end]):
+            end += 1
+        if end - start < 2:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(end - start, _MAX_CONCURRENT_STEPS)) as pool:
+            futures = {}
+            for index in range(start, end):
+                flow_item = flow_items[index]
+                flow_endpoint = flow_item.get('endpoint', '')
+                flow_payload = flow_item.get('payload', {})
+                flow_payload_copy = dict(flow_payload) if isinstance(flow_payload, dict) else {}
+                futures[index] = pool.submit(
+                    self._send_flow_step, 'GET', f"{self.base_url}{flow_endpoint}", flow_payload_copy, flow_endpoint
+                )
+        return futures
+    
+    def _send_flow_step(self, method: str, url: str, payload: Dict[str, Any], endpoint: str, allow_upload: bool = True):
+        """Send one flow step (integration, CRUD or E2E); returns None for unsupported methods."""
+        sender = _FLOW_SENDERS.get(method)
+        if sender is None:
+            return None
+        if method == 'POST' and allow_upload:
+            # Check if this is a file upload endpoint
+            if _UPLOAD_ENDPOINT_RE.search(endpoint):
+                sender = _send_multipart
+        return sender(self.session, url, payload)
+    
+    def _record_step(self, trace: List[Dict[str, Any]], method: str, endpoint: str, url: str,
+                     payload: Any, response, **extra) -> None:
+        """Append one request/response step to a special test's trace (best effort)."""
+        if not self.collect_traces:
+            return
+        try:
+            response_headers = self._snapshot_headers(response.headers)
+            response_text = _truncated_body(response)
+            trace.append({
+                'step': len(trace) + 1,
+                'method': method,
+                'endpoint': endpoint,
+                'url': url,
+                # Session headers only change when auth is (re)applied, never mid-flow
+                'request_headers': self._session_headers_snapshot(),
+                'request_payload': payload,
+                'response_status': response.status_code,
+                'response_headers': response_headers,
+                'response_body': response_text or _EMPTY_BODY,
+                **extra
+            })
+        except Exception:
+            pass
     
     def _execute_special_test(self, test_case: Dict[str, Any]) -> Dict[str, Any]:
         """Execute special test types (integration, CRUD, E2E) that contain multiple operations."""
@@ -159,6 +606,7 @@ class TestExecutor:
         if self.auth_type == 'oauth2':
             token = self._get_oauth2_token()
             if not token:
+                now = _utcnow_iso()
                 return {
                     'test_name': test_name,
                     'test_type': test_type,
@@ -166,8 +614,8 @@ class TestExecutor:
                     'method': test_case.get('method', ''),
                     'status': 'error',
                     'error': 'Failed to obtain OAuth2 access token',
-                    'started_at': datetime.utcnow().isoformat(),
-                    'completed_at': datetime.utcnow().isoformat()
+                    'started_at': now,
+                    'completed_at': now
                 }
         
         result = {
@@ -177,7 +625,7 @@ class TestExecutor:
             'method': test_case.get('method', ''),
             'expected_status': test_case.get('expected_status', [200]),
             'status': 'pending',
-            'started_at': datetime.utcnow().isoformat(),
+            'started_at': _utcnow_iso(),
         }
         
         try:
@@ -185,65 +633,54 @@ class TestExecutor:
             if test_type == 'integration' and 'integration_flow' in test_case:
                 # Execute integration flow (multiple related endpoints)
                 flow_results = []
-                for flow_item in test_case.get('integration_flow', []):
-                    flow_endpoint = flow_item.get('endpoint', '')
-                    flow_method = flow_item.get('method', 'GET').upper()
-                    flow_payload = flow_item.get('payload', {})
-                    
-                    # Replace path parameters
-                    flow_payload_copy = dict(flow_payload) if isinstance(flow_payload, dict) else {}
-                    flow_endpoint = self._replace_path_parameters(flow_endpoint, flow_payload_copy)
-                    flow_url = f"{self.base_url}{flow_endpoint}"
+                flow_items = test_case.get('integration_flow', [])
+                index = 0
+                while index < len(flow_items):
+                    # Consecutive plain GETs (no path params to fill from context) can't affect
+                    # each other, so they are sent concurrently; everything else stays in order.
+                    wave = [flow_items[index]]
+                    if self._is_independent_read(flow_items[index]):
+                        while index + len(wave) < len(flow_items) and self._is_independent_read(flow_items[index + len(wave)]):
+                            wave.append(flow_items[index + len(wave)])
+                    index += len(wave)
                     
-                    # Execute each step
-                    # Check if this is a file upload endpoint
-                    is_file_upload = 'upload' in flow_endpoint.lower() or 'image' in flow_endpoint.lower()
+                    steps = []
+                    for flow_item in wave:
+                        flow_endpoint = flow_item.get('endpoint', '')
+                        flow_method = _step_method(flow_item)
+                        flow_payload = flow_item.get('payload', {})
+                        
+                        # Replace path parameters
+                        flow_payload_copy = dict(flow_payload) if isinstance(flow_payload, dict) else {}
+                        flow_endpoint = self._replace_path_parameters(flow_endpoint, flow_payload_copy)
+                        steps.append((flow_endpoint, flow_method, flow_payload_copy, f"{self.base_url}{flow_endpoint}"))
                     
-                    request_headers = self._snapshot_headers(self.session.headers)
-                    if flow_method == 'GET':
-                        flow_response = self.session.get(flow_url, params=flow_payload_copy, timeout=30)
-                    elif flow_method == 'POST':
-                        if is_file_upload:
-                            files = {'file': ('test.jpg', b'fake image content', 'image/jpeg')}
-                            data = {k: v for k, v in flow_payload_copy.items() if k != 'file'}
-                            flow_response = self.session.post(flow_url, files=files, data=data, timeout=30)
-                        else:
-                            flow_response = self.session.post(flow_url, json=flow_payload_copy, timeout=30)
-                    elif flow_method == 'PUT':
-                        flow_response = self.session.put(flow_url, json=flow_payload_copy, timeout=30)
-                    elif flow_method == 'DELETE':
-                        flow_response = self.session.delete(flow_url, timeout=30)
+                    if len(steps) > 1:
+                        with ThreadPoolExecutor(max_workers=min(len(steps), _MAX_CONCURRENT_STEPS)) as pool:
+                            futures = [
+                                pool.submit(self._send_flow_step, flow_method, flow_url, flow_payload_copy, flow_endpoint)
+                                for flow_endpoint, flow_method, flow_payload_copy, flow_url in steps
+                            ]
+                            # Results (and any exception) are consumed in flow order below
+                            responses = [future.result() for future in futures]
                     else:
-                        continue
-                    
-                    # Extract and store values from response
-                    self._extract_and_store_response_values(flow_response, flow_endpoint, flow_method)
+                        flow_endpoint, flow_method, flow_payload_copy, flow_url = steps[0]
+                        responses = [self._send_flow_step(flow_method, flow_url, flow_payload_copy, flow_endpoint)]
                     
-                    flow_results.append({
-                        'endpoint': flow_endpoint,
-                        'method': flow_method,
-                        'status': flow_response.status_code,
-                        'success': 200 <= flow_response.status_code < 300
-                    })
-                    try:
-                        response_headers = self._snapshot_headers(flow_response.headers)
-                        try:
-                            response_text = flow_response.text
-                        except Exception:
-                            response_text = None
-                        trace.append({
-                            'step': len(trace) + 1,
-                            'method': flow_method,
+                    for (flow_endpoint, flow_method, flow_payload_copy, flow_url), flow_response in zip(steps, responses):
+                        if flow_response is None:
+                            continue
+                        
+                        # Extract and store values from response
+                        self._extract_and_store_response_values(flow_response, flow_endpoint, flow_method)
+                        
+                        flow_results.append({
                             'endpoint': flow_endpoint,
-                            'url': flow_url,
-                            'request_headers': request_headers,
-                            'request_payload': flow_payload_copy,
-                            'response_status': flow_response.status_code,
-                            'response_headers': response_headers,
-                            'response_body': response_text[:2000] if response_text else "(empty response body)"
+                            'method': flow_method,
+                            'status': flow_response.status_code,
+                            'success': 200 <= flow_response.status_code < 300
                         })
-                    except Exception:
-                        pass
+                        self._record_step(trace, flow_method, flow_endpoint, flow_url, flow_payload_copy, flow_response)
                 
                 # Integration test passes if all steps succeed
                 all_passed = all(r['success'] for r in flow_results)
@@ -260,7 +697,7 @@ class TestExecutor:
                 for crud_step in test_case.get('crud_flow', []):
                     operation = crud_step.get('operation')
                     crud_endpoint = crud_step.get('endpoint', '')
-                    crud_method = crud_step.get('method', 'GET').upper()
+                    crud_method = _step_method(crud_step)
                     
                     # Get payload for this operation
                     payload_data = test_case.get('payload', {})
@@ -274,25 +711,22 @@ class TestExecutor:
                     # Replace path parameters (including created ID)
                     crud_payload_copy = dict(crud_payload) if isinstance(crud_payload, dict) else {}
                     if created_id and '{' in crud_endpoint:
-                        # Replace ID placeholder with created ID
-                        crud_endpoint = crud_endpoint.replace('{id}', str(created_id))
-                        crud_endpoint = crud_endpoint.replace('{petId}', str(created_id))
-                        crud_endpoint = crud_endpoint.replace('{orderId}', str(created_id))
-                        crud_endpoint = crud_endpoint.replace('{userId}', str(created_id))
+                        # Replace ID placeholders with created ID
+                        created_id_str = str(created_id)
+                        crud_endpoint = _CREATED_ID_PARAM_RE.sub(lambda _: created_id_str, crud_endpoint)
                     
                     crud_endpoint = self._replace_path_parameters(crud_endpoint, crud_payload_copy)
                     crud_url = f"{self.base_url}{crud_endpoint}"
                     
                     # Execute CRUD operation
-                    request_headers = self._snapshot_headers(self.session.headers)
-                    if crud_method == 'GET':
-                        crud_response = self.session.get(crud_url, params=crud_payload_copy, timeout=30)
-                    elif crud_method == 'POST':
-                        crud_response = self.session.post(crud_url, json=crud_payload_copy, timeout=30)
+                    crud_response = self._send_flow_step(crud_method, crud_url, crud_payload_copy, crud_endpoint, allow_upload=False)
+                    if crud_response is None:
+                        continue
+                    if crud_method == 'POST':
                         # Extract ID from response if available and store in context
                         created_id = None
                         try:
-                            response_data = crud_response.json()
+                            response_data = json_loads(crud_response.content)
                             created_id = response_data.get('id') or response_data.get('petId') or response_data.get('orderId') or response_data.get('userId')
                             if created_id:
                                 # Store in context for future use
@@ -303,36 +737,12 @@ class TestExecutor:
                         
                         # Also extract other values from response
                         self._extract_and_store_response_values(crud_response, crud_endpoint, crud_method)
-                    elif crud_method == 'PUT':
-                        crud_response = self.session.put(crud_url, json=crud_payload_copy, timeout=30)
-                    elif crud_method == 'DELETE':
-                        crud_response = self.session.delete(crud_url, timeout=30)
-                    else:
-                        continue
                     
                     crud_results[operation] = {
                         'status': crud_response.status_code,
                         'success': 200 <= crud_response.status_code < 300
                     }
-                    try:
-                        response_headers = self._snapshot_headers(crud_response.headers)
-                        try:
-                            response_text = crud_response.text
-                        except Exception:
-                            response_text = None
-                        trace.append({
-                            'step': len(trace) + 1,
-                            'method': crud_method,
-                            'endpoint': crud_endpoint,
-                            'url': crud_url,
-                            'request_headers': request_headers,
-                            'request_payload': crud_payload_copy,
-                            'response_status': crud_response.status_code,
-                            'response_headers': response_headers,
-                            'response_body': response_text[:2000] if response_text else "(empty response body)"
-                        })
-                    except Exception:
-                        pass
+                    self._record_step(trace, crud_method, crud_endpoint, crud_url, crud_payload_copy, crud_response)
                 
                 # CRUD test passes if all operations succeed
                 all_passed = all(r['success'] for r in crud_results.values())
@@ -348,10 +758,17 @@ class TestExecutor:
                 e2e_results = []
                 executed_steps = []  # Track executed steps for rollback
                 
+                # Without rollback a failed step doesn't stop the flow, so runs of independent
+                # reads can be sent together; their responses are still handled in order below.
+                prefetched: Dict[int, Future] = {}
+                
                 try:
                     for step_idx, e2e_step in enumerate(e2e_flow):
+                        if not rollback_ops and step_idx not in prefetched:
+                            prefetched = self._prefetch_independent_reads(e2e_flow, step_idx)
+                        
                         e2e_endpoint = e2e_step.get('endpoint', '')
-                        e2e_method = e2e_step.get('method', 'GET').upper()
+                        e2e_method = _step_method(e2e_step)
                         e2e_payload = e2e_step.get('payload', {})
                         
                         # Replace path parameters
@@ -369,25 +786,11 @@ class TestExecutor:
                         executed_steps.append(step_info)
                         
                         # Execute E2E step
-                        # Check if this is a file upload endpoint
-                        is_file_upload = 'upload' in e2e_endpoint.lower() or 'image' in e2e_endpoint.lower()
-                        
-                        request_headers = self._snapshot_headers(self.session.headers)
-                        if e2e_method == 'GET':
-                            e2e_response = self.session.get(e2e_url, params=e2e_payload_copy, timeout=30)
-                        elif e2e_method == 'POST':
-                            if is_file_upload:
-                                # Handle file upload with multipart/form-data
-                                files = {'file': ('test.jpg', b'fake image content', 'image/jpeg')}
-                                data = {k: v for k, v in e2e_payload_copy.items() if k != 'file'}
-                                e2e_response = self.session.post(e2e_url, files=files, data=data, timeout=30)
-                            else:
-                                e2e_response = self.session.post(e2e_url, json=e2e_payload_copy, timeout=30)
-                        elif e2e_method == 'PUT':
-                            e2e_response = self.session.put(e2e_url, json=e2e_payload_copy, timeout=30)
-                        elif e2e_method == 'DELETE':
-                            e2e_response = self.session.delete(e2e_url, timeout=30)
+                        if step_idx in prefetched:
+                            e2e_response = prefetched[step_idx].result()
                         else:
+                            e2e_response = self._send_flow_step(e2e_method, e2e_url, e2e_payload_copy, e2e_endpoint)
+                        if e2e_response is None:
                             continue
                         
                         # Extract and store values from response
@@ -403,25 +806,7 @@ class TestExecutor:
                         })
                         
                         # Record trace
-                        try:
-                            response_headers = self._snapshot_headers(e2e_response.headers)
-                            try:
-                                response_text = e2e_response.text
-                            except Exception:
-                                response_text = None
-                            trace.append({
-                                'step': len(trace) + 1,
-                                'method': e2e_method,
-                                'endpoint': e2e_endpoint,
-                                'url': e2e_url,
-                                'request_headers': request_headers,
-                                'request_payload': e2e_payload_copy,
-                                'response_status': e2e_response.status_code,
-                                'response_headers': response_headers,
-                                'response_body': response_text[:2000] if response_text else "(empty response body)"
-                            })
-                        except Exception:
-                            pass
+                        self._record_step(trace, e2e_method, e2e_endpoint, e2e_url, e2e_payload_copy, e2e_response)
                         
                         # If step failed and rollback is configured, execute rollback
                         if not step_success and rollback_ops:
@@ -430,13 +815,12 @@ class TestExecutor:
                             for rollback_op in rollback_ops:
                                 try:
                                     rollback_endpoint = rollback_op.get('endpoint', '')
-                                    rollback_method = rollback_op.get('method', 'DELETE').upper()
+                                    rollback_method = _step_method(rollback_op, 'DELETE')
                                     
                                     # Replace path parameters in rollback endpoint using context
                                     rollback_endpoint = self._replace_path_parameters(rollback_endpoint, {})
                                     rollback_url = f"{self.base_url}{rollback_endpoint}"
                                     
-                                    rollback_headers = self._snapshot_headers(self.session.headers)
                                     if rollback_method == 'DELETE':
                                         rollback_response = self.session.delete(rollback_url, timeout=30)
                                     elif rollback_method == 'POST':
@@ -460,26 +844,8 @@ class TestExecutor:
                                     })
                                     
                                     # Record rollback in trace
-                                    try:
-                                        rollback_response_headers = self._snapshot_headers(rollback_response.headers)
-                                        try:
-                                            rollback_response_text = rollback_response.text
-                                        except Exception:
-                                            rollback_response_text = None
-                                        trace.append({
-                                            'step': len(trace) + 1,
-                                            'method': rollback_method,
-                                            'endpoint': rollback_endpoint,
-                                            'url': rollback_url,
-                                            'request_headers': rollback_headers,
-                                            'request_payload': rollback_op.get('payload', {}),
-                                            'response_status': rollback_response.status_code,
-                                            'response_headers': rollback_response_headers,
-                                            'response_body': rollback_response_text[:2000] if rollback_response_text else "(empty response body)",
-                                            'is_rollback': True
-                                        })
-                                    except Exception:
-                                        pass
+                                    self._record_step(trace, rollback_method, rollback_endpoint, rollback_url,
+                                                      rollback_op.get('payload', {}), rollback_response, is_rollback=True)
                                     
                                 except Exception as rollback_error:
                                     logger.error(f"Rollback operation failed: {str(rollback_error)}")
@@ -521,7 +887,7 @@ class TestExecutor:
             result['error'] = str(e)
             logger.error(f"Special test execution error: {str(e)}")
         
-        result['completed_at'] = datetime.utcnow().isoformat()
+        result['completed_at'] = _utcnow_iso()
         if trace:
             result['trace'] = trace
         return result
@@ -531,16 +897,9 @@ class TestExecutor:
         if not self.auth_type or not self.auth_credentials:
             return
         
-        from app.core.security import decrypt_data
-        
         try:
-            creds = decrypt_data(self.auth_credentials)
-            import json
-            try:
-                creds_dict = json.loads(creds)
-            except json.JSONDecodeError:
-                # Fallback to eval for backward compatibility (not recommended)
-                creds_dict = eval(creds) if isinstance(creds, str) else creds
+            # Decrypted once per executor (i.e. once per run)
+            creds_dict = _decrypt_credentials(self.auth_credentials)
             
             if self.auth_type == 'basic':
                 username = creds_dict.get('username', '')
@@ -569,10 +928,30 @@ class TestExecutor:
         
         # Check if we have a valid cached token
         if self.oauth2_token and self.oauth2_token_expires_at:
-            from datetime import datetime
             if datetime.utcnow() < self.oauth2_token_expires_at:
                 return self.oauth2_token
         
+        with self._oauth2_lock:
+            # Another worker thread may have refreshed it while this one waited
+            if self.oauth2_token and self.oauth2_token_expires_at:
+                if datetime.utcnow() < self.oauth2_token_expires_at:
+                    return self.oauth2_token
+            return self._refresh_oauth2_token()
+    
+    def _refresh_oauth2_token(self) -> Optional[str]:
+        """Fetch a new token (or reuse another executor's) and apply it to the session."""
+        # Another executor may already hold a token for the same client credentials
+        cache_key = hashlib.blake2b(
+            json_dumps(self.oauth2_creds, sort_keys=True).encode(), digest_size=16
+        ).hexdigest()
+        with _OAUTH2_TOKENS_LOCK:
+            shared = _OAUTH2_TOKENS.get(cache_key)
+        if shared and datetime.utcnow() < shared[1]:
+            self.oauth2_token, self.oauth2_token_expires_at = shared
+            self.session.headers.update({'Authorization': f'Bearer {self.oauth2_token}'})
+            self._request_headers_snapshot = None
+            return self.oauth2_token
+        
         try:
             token_url = self.oauth2_creds.get('token_url')
             client_id = self.oauth2_creds.get('client_id')
@@ -595,7 +974,7 @@ class TestExecutor:
                 token_data['scope'] = scope
             
             # Request access token
-            response = requests.post(
+            response = _TOKEN_SESSION.post(
                 token_url,
                 data=token_data,
                 headers={'Content-Type': 'application/x-www-form-urlencoded'},
@@ -603,18 +982,20 @@ class TestExecutor:
             )
             
             if response.status_code == 200:
-                token_response = response.json()
+                token_response = json_loads(response.content)
                 access_token = token_response.get('access_token')
                 expires_in = token_response.get('expires_in', 3600)  # Default 1 hour
                 
                 if access_token:
                     self.oauth2_token = access_token
                     # Set expiration time (with 60 second buffer)
-                    from datetime import datetime, timedelta
                     self.oauth2_token_expires_at = datetime.utcnow() + timedelta(seconds=expires_in - 60)
+                    with _OAUTH2_TOKENS_LOCK:
+                        _OAUTH2_TOKENS[cache_key] = (access_token, self.oauth2_token_expires_at)
                     
                     # Update session headers with Bearer token
                     self.session.headers.update({'Authorization': f'Bearer {access_token}'})
+                    self._request_headers_snapshot = None
                     return access_token
                 else:
                     logger.error("OAuth2 token response missing access_token")
@@ -635,12 +1016,13 @@ class TestExecutor:
             test_case: Test case definition
         
         Returns:
-            Test execution result
+            Test execution result (a plain dict: results are stored as JSON on the
+            execution and read back by reports and integrations as-is)
         """
         test_type = test_case.get('type', 'unknown')
         
         # Handle special test types (integration, crud, e2e)
-        if test_type in ['integration', 'crud', 'e2e']:
+        if test_type in _SPECIAL_TEST_TYPES:
             return self._execute_special_test(test_case)
         
         endpoint = test_case.get('endpoint', '')
@@ -658,7 +1040,6 @@ class TestExecutor:
                 endpoint = parsed.path
             else:
                 # Try to extract URL from cURL-like string
-                import re
                 url_match = re.search(r'https?://[^\s"\']+', endpoint)
                 if url_match:
                     parsed = urlparse(url_match.group(0))
@@ -670,7 +1051,7 @@ class TestExecutor:
         if not endpoint.startswith('/'):
             endpoint = '/' + endpoint
         
-        method = test_case.get('method', 'GET').upper()
+        method = _step_method(test_case)
         payload = test_case.get('payload') or {}
         expected_status = test_case.get('expected_status', [200])
         headers = test_case.get('headers', {})
@@ -690,7 +1071,7 @@ class TestExecutor:
         files = {}
         
         # For GET/DELETE, all params go to query
-        if method in ['GET', 'DELETE']:
+        if method in _QUERY_ONLY_METHODS:
             query_params = payload_copy
         else:
             # For POST/PUT/PATCH, separate based on content type
@@ -721,6 +1102,7 @@ class TestExecutor:
         if self.auth_type == 'oauth2':
             token = self._get_oauth2_token()
             if not token:
+                now = _utcnow_iso()
                 return {
                     'test_name': test_case.get('name', 'Unknown'),
                     'test_type': test_type,
@@ -728,8 +1110,8 @@ class TestExecutor:
                     'method': method,
                     'status': 'error',
                     'error': 'Failed to obtain OAuth2 access token',
-                    'started_at': datetime.utcnow().isoformat(),
-                    'completed_at': datetime.utcnow().isoformat()
+                    'started_at': now,
+                    'completed_at': now
                 }
         
         result = {
@@ -739,107 +1121,57 @@ class TestExecutor:
             'method': method,
             'expected_status': expected_status,
             'status': 'pending',
-            'started_at': datetime.utcnow().isoformat(),
+            'started_at': _utcnow_iso(),
         }
         trace: List[Dict[str, Any]] = []
         
         try:
             # Check if this is a file upload endpoint (legacy detection for backward compatibility)
-            is_file_upload = 'upload' in endpoint.lower() or 'image' in endpoint.lower() or 'file' in endpoint.lower()
+            is_file_upload = bool(_FILE_ENDPOINT_RE.search(endpoint))
             
             # For negative/security/boundary tests on file upload endpoints, don't send file to test validation
-            test_name = test_case.get('name', '').lower()
-            is_negative_test = 'negative' in test_name or 'security' in test_name or 'missing required' in test_name
-            is_boundary_test = 'boundary' in test_name and ('empty' in test_name or 'negative' in test_name)
+            kind = _classify_test(test_case)
+            is_negative_test = bool(kind & _TestKind.INVALID_INPUT)
+            is_boundary_test = bool(kind & _TestKind.EMPTY_BOUNDARY)
             should_send_file = is_file_upload and not is_negative_test and not is_boundary_test
             
-            # Prepare request based on content type
-            request_headers = self._snapshot_headers(self.session.headers)
-
-            if method == 'GET':
-                response = self.session.get(url, params=query_params, timeout=30)
-            elif method == 'POST':
-                if is_multipart:
-                    # Multipart form data with files
-                    if files:
-                        response = self.session.post(url, files=files, data=form_data, timeout=30)
-                    else:
-                        # Multipart without files (just form data)
-                        response = self.session.post(url, data=form_data, timeout=30)
-                elif is_form_data:
-                    # URL-encoded form data
-                    response = self.session.post(url, data=form_data, timeout=30)
-                elif should_send_file:
-                    # Legacy file upload detection (for backward compatibility)
-                    files_legacy = {'file': ('test.jpg', b'fake image content', 'image/jpeg')}
-                    data_legacy = {k: v for k, v in body_payload.items() if k != 'file'}
-                    response = self.session.post(url, files=files_legacy, data=data_legacy, timeout=30)
-                else:
-                    # JSON payload
-                    if is_file_upload and is_negative_test:
-                        # For negative tests on file upload endpoints, send as form data to test validation
-                        response = self.session.post(url, data=body_payload, timeout=30)
-                    else:
-                        # Ensure we send JSON even if body_payload is empty (for negative tests)
-                        # Empty dict {} is valid JSON, but ensure Content-Type is set
-                        if not body_payload:
-                            # For empty payloads, explicitly set Content-Type
-                            headers = {'Content-Type': 'application/json'}
-                            response = self.session.post(url, json={}, headers=headers, timeout=30)
-                        else:
-                            response = self.session.post(url, json=body_payload, timeout=30)
-            elif method == 'PUT':
-                if is_multipart:
-                    # Multipart form data
-                    if files:
-                        response = self.session.put(url, files=files, data=form_data, timeout=30)
-                    else:
-                        response = self.session.put(url, data=form_data, timeout=30)
-                elif is_form_data:
-                    # URL-encoded form data
-                    response = self.session.put(url, data=form_data, timeout=30)
-                else:
-                    # JSON payload - ensure we have a complete payload for PUT
-                    if not body_payload and endpoint:
-                        # Generate minimal valid payload
-                        if '/pet' in endpoint:
-                            body_payload = {
-                                'id': 1,
-                                'name': 'Updated Pet',
-                                'status': 'available',
-                                'category': {'id': 1, 'name': 'Dogs'},
-                                'tags': [{'id': 1, 'name': 'friendly'}],
-                                'photoUrls': ['https://example.com/photo.jpg']
-                            }
-                        elif '/user' in endpoint:
-                            body_payload = {
-                                'id': 1,
-                                'username': 'updateduser',
-                                'firstName': 'Updated',
-                                'lastName': 'User',
-                                'email': 'updated@example.com',
-                                'password': 'password123',
-                                'phone': '1234567890',
-                                'userStatus': 1
-                            }
-                    response = self.session.put(url, json=body_payload, timeout=30)
-            elif method == 'PATCH':
-                if is_form_data or is_multipart:
-                    if files:
-                        response = self.session.patch(url, files=files, data=form_data, timeout=30)
-                    else:
-                        response = self.session.patch(url, data=form_data, timeout=30)
-                else:
-                    # Ensure we send JSON even if body_payload is empty
-                    if not body_payload:
-                        headers = {'Content-Type': 'application/json'}
-                        response = self.session.patch(url, json={}, headers=headers, timeout=30)
-                    else:
-                        response = self.session.patch(url, json=body_payload, timeout=30)
-            elif method == 'DELETE':
-                response = self.session.delete(url, params=query_params, timeout=30)
-            else:
+            # Build the request arguments once, then send with a single session.request call
+            request_kwargs: Dict[str, Any] = {'timeout': 30}
+            if method in ('GET', 'DELETE'):
+                request_kwargs['params'] = query_params
+            elif method not in ('POST', 'PUT', 'PATCH'):
                 raise ValueError(f"Unsupported method: {method}")
+            elif is_multipart or (is_form_data and method == 'PATCH'):
+                # Multipart form data (requests falls back to URL-encoding without files)
+                request_kwargs['files'] = files
+                request_kwargs['data'] = form_data
+            elif is_form_data:
+                # URL-encoded form data
+                request_kwargs['data'] = form_data
+            elif method == 'POST' and should_send_file:
+                # Legacy file upload detection (for backward compatibility)
+                request_kwargs['files'] = {'file': ('test.jpg', b'fake image content', 'image/jpeg')}
+                request_kwargs['data'] = {k: v for k, v in body_payload.items() if k != 'file'}
+            elif method == 'POST' and is_file_upload and is_negative_test:
+                # For negative tests on file upload endpoints, send as form data to test validation
+                request_kwargs['data'] = body_payload
+            else:
+                # JSON payload - ensure we have a complete payload for PUT
+                if method == 'PUT' and not body_payload and endpoint:
+                    # Use a minimal valid payload for known resources
+                    body_payload = next(
+                        (default for path, default in _DEFAULT_PUT_PAYLOADS if path in endpoint),
+                        body_payload
+                    )
+                request_kwargs['json'] = body_payload
+                if not body_payload and method != 'PUT':
+                    # Send JSON even for empty payloads (negative tests), with an explicit Content-Type
+                    request_kwargs['headers'] = _JSON_HEADERS
+            if method is _GET and test_case.get('cacheable'):
+                # Tests marked cacheable may share one response for identical GETs
+                response = self._cached_get(url, query_params, request_kwargs)
+            else:
+                response = self.session.request(method, url, **request_kwargs)
             
             # Extract and store values from response for use in dependent tests
             self._extract_and_store_response_values(response, endpoint, method)
@@ -851,39 +1183,44 @@ class TestExecutor:
             # Capture response for trace and result
             content_type = response.headers.get('Content-Type', '').lower()
             response_headers = self._snapshot_headers(response.headers)
-            response_text = None
-            try:
-                response_text = response.text
-            except Exception:
-                try:
-                    response_text = response.content.decode('utf-8', errors='replace')
-                except Exception:
-                    response_text = None
+            # Only the first 2000 characters are kept for non-JSON bodies and traces,
+            # so only those are decoded
+            capture_body = self.capture_response_bodies or any(
+                assertion.get('type') == 'response_body' for assertion in test_case.get('assertions') or []
+            )
+            if capture_body:
+                response_text, response_text_truncated = _body_preview(response)
+                body_preview = response_text or _EMPTY_BODY
+            else:
+                # Nothing reads the body: skip decoding, parsing and pretty-printing it
+                response_text, response_text_truncated = None, False
+                body_preview = _BODY_NOT_CAPTURED
 
-            # Populate result response body
-            if response_text and ('application/json' in content_type or 'text/json' in content_type):
+            # Populate result response body (parsed JSON is kept for assertions)
+            response_json = _UNPARSED
+            if not capture_body:
+                result['response_body'] = body_preview
+            elif response_text and ('application/json' in content_type or 'text/json' in content_type):
                 try:
-                    response_json = json.loads(response_text)
-                    result['response_body'] = json.dumps(response_json, indent=2) if response_json else response_text
-                except (ValueError, json.JSONDecodeError):
-                    result['response_body'] = response_text[:2000] if len(response_text) > 2000 else response_text
+                    response_json = json_loads(response.content)
+                    result['response_body'] = json_pretty(response_json) if response_json else response.text
+                except ValueError:
+                    result['response_body'] = body_preview
             else:
-                if response_text:
-                    result['response_body'] = response_text[:2000] if len(response_text) > 2000 else response_text
-                    if len(response_text) > 2000:
-                        result['response_body_truncated'] = True
-                        result['response_body_full_length'] = len(response_text)
-                else:
-                    result['response_body'] = "(empty response body)"
+                result['response_body'] = body_preview
+                if response_text_truncated:
+                    result['response_body_truncated'] = True
+                    result['response_body_full_length'] = len(response.content)  # bytes
 
             result['response_headers'] = response_headers
-            result['completed_at'] = datetime.utcnow().isoformat()
+            result['completed_at'] = _utcnow_iso()
             
             # Store request details in result object (not just trace) for reports
+            request_headers = self._session_headers_snapshot()
             result['request_headers'] = request_headers
             result['query_params'] = query_params
             # Store body payload for POST/PUT/PATCH, None for GET/DELETE
-            if method not in ['GET', 'DELETE']:
+            if method not in _QUERY_ONLY_METHODS:
                 result['payload'] = body_payload
                 result['request_body'] = body_payload
             else:
@@ -891,18 +1228,19 @@ class TestExecutor:
                 result['request_body'] = None
             
             # Trace for single-step tests
-            trace.append({
-                'step': 1,
-                'method': method,
-                'endpoint': endpoint,
-                'url': url,
-                'request_headers': request_headers,
-                'request_query': query_params,
-                'request_body': body_payload if method not in ['GET', 'DELETE'] else None,
-                'response_status': actual_status,
-                'response_headers': response_headers,
-                'response_body': response_text[:2000] if response_text else "(empty response body)"
-            })
+            if self.collect_traces:
+                trace.append({
+                    'step': 1,
+                    'method': method,
+                    'endpoint': endpoint,
+                    'url': url,
+                    'request_headers': request_headers,
+                    'request_query': query_params,
+                    'request_body': body_payload if method not in _QUERY_ONLY_METHODS else None,
+                    'response_status': actual_status,
+                    'response_headers': response_headers,
+                    'response_body': body_preview
+                })
             
             # Evaluate assertions if provided
             assertions = test_case.get('assertions', [])
@@ -914,7 +1252,8 @@ class TestExecutor:
                     assertion_result = self._evaluate_assertion(
                         assertion,
                         response,
-                        actual_status
+                        actual_status,
+                        response_json
                     )
                     assertion_results.append(assertion_result)
                     if not assertion_result.get('passed', False):
@@ -922,12 +1261,10 @@ class TestExecutor:
                 
                 result['assertion_results'] = assertion_results
             
-            # Determine test type for smarter status evaluation
-            test_name = test_case.get('name', '').lower()
-            test_type = test_case.get('type', '').lower()
-            is_negative_or_security = 'negative' in test_name or 'security' in test_name or 'validation' in test_name or test_type in ['negative', 'security', 'validation']
-            is_boundary = 'boundary' in test_name or test_type == 'boundary'
-            is_performance = 'performance' in test_name or test_type == 'performance'
+            # Test kind (classified above) for smarter status evaluation
+            is_negative_or_security = bool(kind & _TestKind.NEGATIVE)
+            is_boundary = bool(kind & _TestKind.BOUNDARY)
+            is_performance = bool(kind & _TestKind.PERFORMANCE)
             
             # For file upload endpoints getting 415, accept it as expected for negative/boundary tests
             if actual_status == 415 and is_file_upload and (is_negative_or_security or is_boundary):
@@ -936,7 +1273,7 @@ class TestExecutor:
                 result['note'] = 'File upload endpoint correctly rejected invalid content type'
             # For negative/security tests, accept 400, 422, 403, 404, 415, 500 as valid rejections
             # 500 indicates server-side validation rejected the input (validation is working)
-            elif is_negative_or_security and actual_status in [400, 422, 403, 404, 415, 500]:
+            elif is_negative_or_security and actual_status in _REJECTION_STATUSES:
                 result['status'] = 'passed'
                 if actual_status == 500:
                     result['note'] = 'API server error indicates input was rejected (validation working)'
@@ -949,14 +1286,14 @@ class TestExecutor:
                 result['security_finding'] = True
                 result['severity'] = 'high'
             # For performance tests, accept 200, 201, 400, 422, 500 (500 might indicate payload too large, which is valid)
-            elif is_performance and actual_status in [200, 201, 400, 422, 500]:
+            elif is_performance and actual_status in _ACCEPT_OR_REJECT_STATUSES:
                 result['status'] = 'passed'
-                if actual_status in [400, 422, 500]:
+                if actual_status in _REJECTED_PAYLOAD_STATUSES:
                     result['note'] = 'API correctly rejected oversized payload or server error indicates rejection'
             # For boundary tests, accept 200, 201, 400, 422, 500 (boundary values might be valid or invalid)
-            elif is_boundary and actual_status in [200, 201, 400, 422, 500]:
+            elif is_boundary and actual_status in _ACCEPT_OR_REJECT_STATUSES:
                 result['status'] = 'passed'
-                if actual_status in [400, 422, 500]:
+                if actual_status in _REJECTED_PAYLOAD_STATUSES:
                     result['note'] = 'API correctly rejected invalid boundary value'
             # Standard status check
             elif actual_status in expected_status:
@@ -980,7 +1317,7 @@ class TestExecutor:
         except Exception as e:
             result['status'] = 'error'
             result['error'] = str(e)
-            result['completed_at'] = datetime.utcnow().isoformat()
+            result['completed_at'] = _utcnow_iso()
             logger.error(f"Test execution error: {str(e)}")
         
         # attach trace for single-step tests
@@ -1000,34 +1337,85 @@ class TestExecutor:
             Execution summary
         """
         results = []
-        passed = 0
-        failed = 0
-        errors = 0
-        
-        for test_case in test_cases:
-            result = self.execute_test(test_case)
+        for _, result, error in self.iter_test_results(test_cases):
+            if error is not None:
+                raise error
             results.append(result)
-            
-            if result['status'] == 'passed':
-                passed += 1
-            elif result['status'] == 'failed':
-                failed += 1
-            else:
-                errors += 1
         
+        # Anything that neither passed nor failed counts as an error
+        statuses = Counter(result['status'] for result in results)
+        passed = statuses['passed']
+        failed = statuses['failed']
+        
+        now = None if results else _utcnow_iso()
         summary = {
             'total': len(test_cases),
             'passed': passed,
             'failed': failed,
-            'errors': errors,
+            'errors': len(results) - passed - failed,
             'results': results,
-            'started_at': results[0]['started_at'] if results else datetime.utcnow().isoformat(),
-            'completed_at': results[-1]['completed_at'] if results else datetime.utcnow().isoformat(),
+            'started_at': results[0]['started_at'] if results else now,
+            'completed_at': results[-1]['completed_at'] if results else now,
         }
         
         return summary
     
-    def _evaluate_assertion(self, assertion: Dict[str, Any], response, actual_status: int) -> Dict[str, Any]:
+    def iter_test_results(
+        self, test_cases: List[Dict[str, Any]]
+    ) -> Iterator[Tuple[Dict[str, Any], Optional[Dict[str, Any]], Optional[Exception]]]:
+        """
+        Execute test cases, yielding ``(test_case, result, error)`` in suite order.
+        
+        Consecutive plain GET tests don't depend on each other, so they run concurrently;
+        their context updates are applied afterwards in suite order. A test that raises
+        yields its exception as ``error`` (and ``result`` None) so the caller decides
+        whether to stop.
+        """
+        index = 0
+        while index < len(test_cases):
+            end = index
+            while end < len(test_cases) and self._is_independent_test(test_cases[end]):
+                end += 1
+            if end - index > 1:
+                if self.auth_type == 'oauth2':
+                    # Fetch the token before the batch so workers don't all race to refresh it
+                    self._get_oauth2_token()
+                with ThreadPoolExecutor(max_workers=min(end - index, _MAX_CONCURRENT_STEPS)) as pool:
+                    futures = [pool.submit(self._execute_deferring_extraction, test_case) for test_case in test_cases[index:end]]
+                    outcomes = [future.result() for future in futures]
+                batch = test_cases[index:end]
+                index = end
+            else:
+                try:
+                    outcomes = [(self.execute_test(test_cases[index]), [], None)]
+                except Exception as e:
+                    outcomes = [(None, [], e)]
+                batch = test_cases[index:index + 1]
+                index += 1
+            
+            for test_case, (result, extractions, error) in zip(batch, outcomes):
+                for values in extractions:
+                    self.context.update(values)
+                yield test_case, result, error
+    
+    def _is_independent_test(self, test_case: Dict[str, Any]) -> bool:
+        """A single-step GET test with no path parameters (safe to run alongside others)."""
+        return test_case.get('type') not in _SPECIAL_TEST_TYPES and self._is_independent_read(test_case)
+    
+    def _execute_deferring_extraction(
+        self, test_case: Dict[str, Any]
+    ) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, str]], Optional[Exception]]:
+        """Run one test in a worker thread: (result, extracted context values to apply, error)."""
+        self._deferred.extractions = []
+        try:
+            result = self.execute_test(test_case)
+            return result, self._deferred.extractions, None
+        except Exception as e:
+            return None, [], e
+        finally:
+            self._deferred.extractions = None
+    
+    def _evaluate_assertion(self, assertion: Dict[str, Any], response, actual_status: int, response_json: Any = _UNPARSED) -> Dict[str, Any]:
         """
         Evaluate a single assertion against the response.
         
@@ -1035,6 +1423,7 @@ class TestExecutor:
             assertion: Assertion definition
             response: HTTP response object
             actual_status: Actual HTTP status code
+            response_json: Body already parsed by the caller (parsed here if not given)
             
         Returns:
             Assertion evaluation result
@@ -1061,7 +1450,8 @@ class TestExecutor:
                 
             elif assertion_type == 'response_body':
                 try:
-                    response_json = response.json()
+                    if response_json is _UNPARSED:
+                        response_json = json_loads(response.content)
                     actual_value = self._get_json_value(response_json, field) if field else response.text
                 except:
                     actual_value = response.text
@@ -1096,28 +1486,11 @@ class TestExecutor:
     
     def _check_condition(self, actual: Any, condition: str, expected: Any) -> bool:
         """Check if actual value meets the condition against expected value."""
+        check = _CONDITION_CHECKS.get(condition)
+        if check is None:
+            return False
         try:
-            if condition == 'equals':
-                return actual == expected
-            elif condition == 'not_equals':
-                return actual != expected
-            elif condition == 'contains':
-                return str(expected) in str(actual)
-            elif condition == 'not_contains':
-                return str(expected) not in str(actual)
-            elif condition == 'greater_than':
-                return float(actual) > float(expected)
-            elif condition == 'less_than':
-                return float(actual) < float(expected)
-            elif condition == 'matches':
-                import re
-                return bool(re.search(str(expected), str(actual)))
-            elif condition == 'exists':
-                return actual is not None and actual != ''
-            elif condition == 'not_exists':
-                return actual is None or actual == ''
-            else:
-                return False
+            return check(actual, expected)
         except Exception:
             return False
     
@@ -1128,17 +1501,12 @@ class TestExecutor:
         
         try:
             # Simple dot notation support
-            keys = path.split('.')
             value = json_obj
-            for key in keys:
+            for key, index in _json_path_keys(path):
                 if isinstance(value, dict):
                     value = value.get(key)
                 elif isinstance(value, list):
-                    try:
-                        index = int(key)
-                        value = value[index] if 0 <= index < len(value) else None
-                    except ValueError:
-                        value = None
+                    value = value[index] if index is not None and 0 <= index < len(value) else None
                 else:
                     return None
                 if value is None:
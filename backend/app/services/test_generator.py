@@ -8,6 +8,7 @@ from enum import Enum
 import random
 import string
 import re
+from concurrent.futures import ThreadPoolExecutor
 import schemathesis
 from faker import Faker
 try:
@@ -31,6 +32,18 @@ except ImportError:
         RecursiveCharacterTextSplitter = None
 logger = logging.getLogger(__name__)
 
+# Patterns used per endpoint (and when salvaging LLM output), compiled once
+_RESOURCE_RE = re.compile(r'^/([^/]+)')
+_TRAILING_RESOURCE_RE = re.compile(r'/([^/]+)(?:/\{[^}]+\})?/?$')
+_PATH_PARAM_RE = re.compile(r'\{(\w+)\}')
+_JSON_ARRAY_RE = re.compile(r'\[.*\]', re.DOTALL)
+_JSON_OBJECT_RE = re.compile(r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}', re.DOTALL)
+_TRAILING_COMMA_OBJECT_RE = re.compile(r',\s*}')
+_TRAILING_COMMA_ARRAY_RE = re.compile(r',\s*]')
+
+# LLM generation is network-bound, so a few endpoints are generated concurrently
+_MAX_CONCURRENT_LLM_REQUESTS = 4
+
 class TestType(str, Enum):
     """Test case types."""
     HAPPY_PATH = "happy_path"
@@ -72,6 +85,8 @@ class TestGenerator:
         self.llm_model = llm_model
         self.llm_endpoint = llm_endpoint
         self.faker = Faker()
+        # Content-type/parameter layout per (method, path); derived from the spec only
+        self._content_info_cache: Dict[tuple, Dict[str, Any]] = {}
    
     def generate_all_tests(
         self,
@@ -90,18 +105,18 @@ class TestGenerator:
        
         # Get endpoints from parser
         endpoints = self.parser.get_endpoints()
+        post_by_resource = self._index_post_endpoints(endpoints)
        
         # Filter endpoints if selection provided
         if selected_endpoints:
-            filtered_endpoints = []
-            for endpoint in endpoints:
-                # Check if this endpoint matches any selected endpoint
-                for selected in selected_endpoints:
-                    if (endpoint.get('path') == selected.get('path') and
-                        endpoint.get('method', '').upper() == selected.get('method', '').upper()):
-                        filtered_endpoints.append(endpoint)
-                        break
-            endpoints = filtered_endpoints
+            selected_keys = {
+                (selected.get('path'), selected.get('method', '').upper())
+                for selected in selected_endpoints
+            }
+            endpoints = [
+                endpoint for endpoint in endpoints
+                if (endpoint.get('path'), endpoint.get('method', '').upper()) in selected_keys
+            ]
        
         # Group endpoints by resource for CRUD and E2E tests
         endpoints_by_resource = self._group_endpoints_by_resource(endpoints)
@@ -109,54 +124,19 @@ class TestGenerator:
         # Store all endpoints for related endpoint discovery in LLM prompts
         self.all_endpoints = endpoints
        
-        for endpoint in endpoints:
-            # If LLM is configured, ONLY use LLM for test generation (no baseline fallback)
-            if self.llm_api_key:
-                # LLM-enhanced tests - REQUIRED when LLM is configured
-                try:
-                    llm_tests = self._generate_llm_tests(endpoint)
-                    if enabled:
-                        llm_tests = [t for t in llm_tests if t.get('type', '').lower() in enabled]
-                    if not llm_tests or len(llm_tests) == 0:
-                        raise ValueError(f"LLM returned no tests for endpoint {endpoint.get('operation_id', endpoint.get('path'))}")
-                    all_tests.extend(llm_tests)
-                except Exception as e:
-                    logger.error(f"LLM test generation failed for {endpoint['operation_id']}: {str(e)}", exc_info=True)
-                    raise RuntimeError(
-                        f"LLM test generation failed for endpoint {endpoint.get('operation_id', endpoint.get('path'))}: {str(e)}. "
-                        f"No fallback tests will be generated. Please check your LLM configuration and try again."
-                    )
-            else:
-                # Baseline tests - only when LLM is NOT configured
-                # Positive/Happy path tests
-                if not enabled or TestType.HAPPY_PATH.value in enabled:
-                    baseline_tests = self._generate_baseline_tests(endpoint)
-                    all_tests.extend(baseline_tests)
-               
-                # Negative tests
-                if not enabled or TestType.NEGATIVE.value in enabled:
-                    negative_tests = self._generate_negative_tests(endpoint)
-                    all_tests.extend(negative_tests)
-               
-                # Boundary value tests
-                if not enabled or TestType.BOUNDARY.value in enabled:
-                    boundary_tests = self._generate_boundary_tests(endpoint)
-                    all_tests.extend(boundary_tests)
-               
-                # Validation tests
-                if not enabled or TestType.VALIDATION.value in enabled:
-                    validation_tests = self._generate_validation_tests(endpoint)
-                    all_tests.extend(validation_tests)
-               
-                # Security tests
-                if not enabled or TestType.SECURITY.value in enabled:
-                    security_tests = self._generate_security_tests(endpoint)
-                    all_tests.extend(security_tests)
-               
-                # Performance tests
-                if not enabled or TestType.PERFORMANCE.value in enabled:
-                    performance_tests = self._generate_performance_tests(endpoint)
-                    all_tests.extend(performance_tests)
+        if self.llm_api_key and len(endpoints) > 1:
+            pool = ThreadPoolExecutor(max_workers=min(len(endpoints), _MAX_CONCURRENT_LLM_REQUESTS))
+            try:
+                # map() keeps results in endpoint order and re-raises the first failure
+                for endpoint_tests in pool.map(
+                    lambda ep: self._generate_for_endpoint(ep, enabled, post_by_resource), endpoints
+                ):
+                    all_tests.extend(endpoint_tests)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+        else:
+            for endpoint in endpoints:
+                all_tests.extend(self._generate_for_endpoint(endpoint, enabled, post_by_resource))
        
         # CRUD operation tests
         if not enabled or TestType.CRUD.value in enabled:
@@ -175,6 +155,64 @@ class TestGenerator:
        
         return all_tests
    
+    def _generate_for_endpoint(
+        self,
+        endpoint: Dict[str, Any],
+        enabled: Optional[set],
+        post_by_resource: Dict[str, Dict[str, Any]],
+    ) -> List[Dict[str, Any]]:
+        """Generate the per-endpoint tests (LLM or baseline) for a single endpoint."""
+        tests = []
+        # If LLM is configured, ONLY use LLM for test generation (no baseline fallback)
+        if self.llm_api_key:
+            # LLM-enhanced tests - REQUIRED when LLM is configured
+            try:
+                llm_tests = self._generate_llm_tests(endpoint)
+                if enabled:
+                    llm_tests = [t for t in llm_tests if t.get('type', '').lower() in enabled]
+                if not llm_tests or len(llm_tests) == 0:
+                    raise ValueError(f"LLM returned no tests for endpoint {endpoint.get('operation_id', endpoint.get('path'))}")
+                tests.extend(llm_tests)
+            except Exception as e:
+                logger.error(f"LLM test generation failed for {endpoint['operation_id']}: {str(e)}", exc_info=True)
+                raise RuntimeError(
+                    f"LLM test generation failed for endpoint {endpoint.get('operation_id', endpoint.get('path'))}: {str(e)}. "
+                    f"No fallback tests will be generated. Please check your LLM configuration and try again."
+                )
+        else:
+            # Baseline tests - only when LLM is NOT configured
+            # Positive/Happy path tests
+            if not enabled or TestType.HAPPY_PATH.value in enabled:
+                baseline_tests = self._generate_baseline_tests(endpoint, post_by_resource)
+                tests.extend(baseline_tests)
+           
+            # Negative tests
+            if not enabled or TestType.NEGATIVE.value in enabled:
+                negative_tests = self._generate_negative_tests(endpoint)
+                tests.extend(negative_tests)
+           
+            # Boundary value tests
+            if not enabled or TestType.BOUNDARY.value in enabled:
+                boundary_tests = self._generate_boundary_tests(endpoint)
+                tests.extend(boundary_tests)
+           
+            # Validation tests
+            if not enabled or TestType.VALIDATION.value in enabled:
+                validation_tests = self._generate_validation_tests(endpoint)
+                tests.extend(validation_tests)
+           
+            # Security tests
+            if not enabled or TestType.SECURITY.value in enabled:
+                security_tests = self._generate_security_tests(endpoint)
+                tests.extend(security_tests)
+           
+            # Performance tests
+            if not enabled or TestType.PERFORMANCE.value in enabled:
+                performance_tests = self._generate_performance_tests(endpoint)
+                tests.extend(performance_tests)
+       
+        return tests
+   
     def _group_endpoints_by_resource(self, endpoints: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
         """Group endpoints by resource (e.g., /pet, /user, /store)."""
         resources = {}
@@ -182,7 +220,7 @@ class TestGenerator:
         for endpoint in endpoints:
             path = endpoint.get('path', '')
             # Extract resource from path (e.g., /pet/{id} -> pet)
-            resource_match = re.match(r'^/([^/]+)', path)
+            resource_match = _RESOURCE_RE.match(path)
             if resource_match:
                 resource = resource_match.group(1)
                 if resource not in resources:
@@ -190,25 +228,37 @@ class TestGenerator:
                 resources[resource].append(endpoint)
        
         return resources
+
+    @staticmethod
+    def _index_post_endpoints(endpoints: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Index POST endpoints by their collection resource name (first match wins)."""
+        post_by_resource: Dict[str, Dict[str, Any]] = {}
+        for ep in endpoints:
+            if ep.get('method', '').upper() != 'POST':
+                continue
+            resource_match = _RESOURCE_RE.match(ep.get('path', ''))
+            if resource_match and ep.get('path', '').rstrip('/') == f"/{resource_match.group(1)}":
+                post_by_resource.setdefault(resource_match.group(1), ep)
+        return post_by_resource
    
-    def _generate_baseline_tests(self, endpoint: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def _generate_baseline_tests(
+        self,
+        endpoint: Dict[str, Any],
+        post_by_resource: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
         """Generate baseline tests using Schemathesis."""
         tests = []
+        if post_by_resource is None:
+            post_by_resource = self._index_post_endpoints(self.parser.get_endpoints())
         path = endpoint['path']
         method = endpoint['method'].upper()
         # If this is a DELETE on a resource with an {id}, prepend a create step so we delete a fresh record
-        if method == 'DELETE' and re.search(r'{(\w+)}', path):
-            resource_match = re.match(r'^/([^/]+)', path)
+        if method == 'DELETE' and _PATH_PARAM_RE.search(path):
+            resource_match = _RESOURCE_RE.match(path)
             if resource_match:
                 resource = resource_match.group(1)
-                create_ep = None
                 # Look for a POST create endpoint for the same resource (without path params)
-                for ep in self.parser.get_endpoints():
-                    if ep.get('method', '').upper() == 'POST':
-                        ep_path = ep.get('path', '').rstrip('/')
-                        if ep_path == f"/{resource}".rstrip('/'):
-                            create_ep = ep
-                            break
+                create_ep = post_by_resource.get(resource)
                 if create_ep:
                     create_payload = self._generate_sample_payload(create_ep)
                     delete_flow = [
@@ -241,17 +291,11 @@ class TestGenerator:
                     # For standalone selection, skip the default DELETE happy path to avoid missing id
                     return tests
         # If this is an UPDATE (PUT/PATCH) with {id}, create first then update the created id
-        if method in ['PUT', 'PATCH'] and re.search(r'{(\w+)}', path):
-            resource_match = re.match(r'^/([^/]+)', path)
+        if method in ['PUT', 'PATCH'] and _PATH_PARAM_RE.search(path):
+            resource_match = _RESOURCE_RE.match(path)
             if resource_match:
                 resource = resource_match.group(1)
-                create_ep = None
-                for ep in self.parser.get_endpoints():
-                    if ep.get('method', '').upper() == 'POST':
-                        ep_path = ep.get('path', '').rstrip('/')
-                        if ep_path == f"/{resource}".rstrip('/'):
-                            create_ep = ep
-                            break
+                create_ep = post_by_resource.get(resource)
                 if create_ep:
                     create_payload = self._generate_sample_payload(create_ep)
                     update_payload = self._generate_sample_payload(endpoint)
@@ -365,7 +409,7 @@ class TestGenerator:
             tests.append(test_case)
        
         # Invalid path parameters
-        path_params = re.findall(r'{(\w+)}', path)
+        path_params = _PATH_PARAM_RE.findall(path)
         for param in path_params:
             # Determine parameter type from OpenAPI spec
             param_type = 'string' # Default
@@ -1182,6 +1226,14 @@ class TestGenerator:
        
         return assertions
    
+    def _cached_content_type(self, endpoint: Dict[str, Any]) -> Dict[str, Any]:
+        """Return _detect_content_type for the endpoint, walking its schema only once."""
+        key = (endpoint.get('method', 'GET').upper(), endpoint.get('path', ''))
+        content_info = self._content_info_cache.get(key)
+        if content_info is None:
+            content_info = self._content_info_cache.setdefault(key, self._detect_content_type(endpoint))
+        return content_info
+
     def _detect_content_type(self, endpoint: Dict[str, Any]) -> Dict[str, Any]:
         """
         Detect the content type and encoding style for the endpoint.
@@ -1413,10 +1465,10 @@ class TestGenerator:
        
         # Extract path parameters from endpoint path (they should NOT be in payload)
         path = endpoint.get('path', '')
-        path_params = set(re.findall(r'{(\w+)}', path))
+        path_params = set(_PATH_PARAM_RE.findall(path))
        
         # Detect content type and parameters
-        content_info = self._detect_content_type(endpoint)
+        content_info = self._cached_content_type(endpoint)
        
         # For GET/DELETE methods, use query parameters
         if method in ['GET', 'DELETE']:
@@ -1704,14 +1756,28 @@ class TestGenerator:
                 'updatedAt': '2024-12-14T00:00:00Z'
             }
    
-    def _generate_from_schema(self, schema: Dict[str, Any], field_name: Optional[str] = None) -> Any:
-        """Generate sample value from JSON schema, properly resolving $ref references."""
+    def _generate_from_schema(
+        self,
+        schema: Dict[str, Any],
+        field_name: Optional[str] = None,
+        seen_refs: frozenset = frozenset(),
+    ) -> Any:
+        """
+        Generate sample value from JSON schema, properly resolving $ref references.
+        
+        seen_refs holds the refs being expanded on the current path; the parser leaves
+        recursive refs (Node.child -> Node) in place, and those stop here.
+        """
         # Resolve $ref if present
         if '$ref' in schema:
+            ref = schema['$ref']
+            if ref in seen_refs:
+                # Recursive schema - don't expand it again
+                return {}
             try:
-                resolved_schema = self.parser.resolve_ref(schema['$ref'])
+                resolved_schema = self.parser.resolve_ref(ref)
                 # Recursively generate from resolved schema
-                return self._generate_from_schema(resolved_schema, field_name)
+                return self._generate_from_schema(resolved_schema, field_name, seen_refs | {ref})
             except (ValueError, KeyError) as e:
                 logger.warning(f"Could not resolve schema reference {schema.get('$ref')}: {e}")
                 # Fallback to basic object structure
@@ -1739,10 +1805,16 @@ class TestGenerator:
             # Also include optional properties with defaults or enums (like status fields)
             for prop_name, prop_schema in properties.items():
                 if prop_name not in required:
+                    nested_refs = seen_refs
                     # Resolve $ref in property schema if present
                     if '$ref' in prop_schema:
+                        prop_ref = prop_schema['$ref']
+                        if prop_ref in seen_refs:
+                            # Optional back-reference to an enclosing schema - leave it out
+                            continue
+                        nested_refs = seen_refs | {prop_ref}
                         try:
-                            prop_schema = self.parser.resolve_ref(prop_schema['$ref'])
+                            prop_schema = self.parser.resolve_ref(prop_ref)
                         except (ValueError, KeyError):
                             pass
                    
@@ -1750,7 +1822,7 @@ class TestGenerator:
                         result[prop_name] = self._get_default_value(prop_schema, prop_name)
                     # Include nested objects even if optional (for completeness)
                     elif prop_schema.get('type') == 'object':
-                        nested_result = self._generate_from_schema(prop_schema, prop_name)
+                        nested_result = self._generate_from_schema(prop_schema, prop_name, nested_refs)
                         if nested_result:
                             result[prop_name] = nested_result
            
@@ -1767,17 +1839,25 @@ class TestGenerator:
         else:
             return self._get_default_value(schema, field_name)
    
-    def _resolve_schema_refs(self, schema: Dict[str, Any]) -> Dict[str, Any]:
-        """Recursively resolve all $ref references in a schema."""
+    def _resolve_schema_refs(self, schema: Dict[str, Any], seen_refs: frozenset = frozenset()) -> Dict[str, Any]:
+        """
+        Recursively resolve all $ref references in a schema.
+        
+        A ref that is already being expanded on the current path (a recursive schema)
+        is kept as a $ref instead of being expanded forever.
+        """
         if not isinstance(schema, dict):
             return schema
         
         # If this is a $ref, resolve it
         if '$ref' in schema:
+            ref = schema['$ref']
+            if ref in seen_refs:
+                return schema
             try:
-                resolved = self.parser.resolve_ref(schema['$ref'])
+                resolved = self.parser.resolve_ref(ref)
                 # Recursively resolve refs in the resolved schema
-                return self._resolve_schema_refs(resolved)
+                return self._resolve_schema_refs(resolved, seen_refs | {ref})
             except (ValueError, KeyError) as e:
                 logger.warning(f"Could not resolve $ref {schema.get('$ref')}: {e}")
                 return schema
@@ -1789,25 +1869,25 @@ class TestGenerator:
                 # Resolve refs in properties
                 resolved[key] = {}
                 for prop_name, prop_schema in value.items():
-                    resolved[key][prop_name] = self._resolve_schema_refs(prop_schema)
+                    resolved[key][prop_name] = self._resolve_schema_refs(prop_schema, seen_refs)
             elif key == 'items' and isinstance(value, dict):
                 # Resolve refs in array items
-                resolved[key] = self._resolve_schema_refs(value)
+                resolved[key] = self._resolve_schema_refs(value, seen_refs)
             elif key == 'allOf' and isinstance(value, list):
                 # Resolve refs in allOf
-                resolved[key] = [self._resolve_schema_refs(item) for item in value]
+                resolved[key] = [self._resolve_schema_refs(item, seen_refs) for item in value]
             elif key == 'oneOf' and isinstance(value, list):
                 # Resolve refs in oneOf
-                resolved[key] = [self._resolve_schema_refs(item) for item in value]
+                resolved[key] = [self._resolve_schema_refs(item, seen_refs) for item in value]
             elif key == 'anyOf' and isinstance(value, list):
                 # Resolve refs in anyOf
-                resolved[key] = [self._resolve_schema_refs(item) for item in value]
+                resolved[key] = [self._resolve_schema_refs(item, seen_refs) for item in value]
             elif isinstance(value, dict):
                 # Recursively resolve nested objects
-                resolved[key] = self._resolve_schema_refs(value)
+                resolved[key] = self._resolve_schema_refs(value, seen_refs)
             elif isinstance(value, list):
                 # Resolve refs in list items
-                resolved[key] = [self._resolve_schema_refs(item) if isinstance(item, dict) else item for item in value]
+                resolved[key] = [self._resolve_schema_refs(item, seen_refs) if isinstance(item, dict) else item for item in value]
             else:
                 resolved[key] = value
         
@@ -2198,7 +2278,7 @@ class TestGenerator:
         endpoint_method = endpoint.get('method', '').upper()
         
         # Extract resource name from path (e.g., /api/pets/{petId} -> pets)
-        resource_match = re.search(r'/([^/]+)(?:/\{[^}]+\})?/?$', endpoint_path)
+        resource_match = _TRAILING_RESOURCE_RE.search(endpoint_path)
         resource_name = resource_match.group(1) if resource_match else None
         
         related = {
@@ -2680,7 +2760,7 @@ Generate payloads using ONLY the field names listed above.
 """
         
         # Check if this is a DELETE or PUT/PATCH endpoint with path parameters
-        has_path_params = bool(re.search(r'\{(\w+)\}', endpoint_path))
+        has_path_params = bool(_PATH_PARAM_RE.search(endpoint_path))
         is_delete = endpoint_method.upper() == 'DELETE'
         is_put_patch = endpoint_method.upper() in ['PUT', 'PATCH']
         needs_create_first = (is_delete or is_put_patch) and has_path_params
@@ -2751,7 +2831,7 @@ Generate payloads using ONLY the field names listed above.
         create_path = ""
         multi_step_format_instructions = ""
         if needs_create_first:
-            resource_match = re.match(r'^/([^/]+)', endpoint_path)
+            resource_match = _RESOURCE_RE.match(endpoint_path)
             if resource_match:
                 resource = resource_match.group(1)
                 # Look for a POST create endpoint for the same resource
@@ -2984,7 +3064,7 @@ Generate the test cases now following ALL instructions above.
             
             # Try to extract JSON array from response
             # First, try to find a complete JSON array
-            json_match = re.search(r'\[.*\]', cleaned_response, re.DOTALL)
+            json_match = _JSON_ARRAY_RE.search(cleaned_response)
             if json_match:
                 # If LLM didn't generate assertions, add them based on response schema
                 expected_status = self._get_expected_status(endpoint)
@@ -2992,8 +3072,8 @@ Generate the test cases now following ALL instructions above.
                 
                 # Try to fix common JSON issues
                 # Remove trailing commas before closing brackets/braces
-                json_str = re.sub(r',\s*}', '}', json_str)
-                json_str = re.sub(r',\s*]', ']', json_str)
+                json_str = _TRAILING_COMMA_OBJECT_RE.sub('}', json_str)
+                json_str = _TRAILING_COMMA_ARRAY_RE.sub(']', json_str)
                 
                 # Try to parse the JSON
                 try:
@@ -3023,8 +3103,7 @@ Generate the test cases now following ALL instructions above.
                         except json.JSONDecodeError:
                             # If still fails, try to extract individual objects
                             # Find all complete JSON objects
-                            object_pattern = r'\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}'
-                            objects = re.findall(object_pattern, json_str, re.DOTALL)
+                            objects = _JSON_OBJECT_RE.findall(json_str)
                             if objects:
                                 test_cases = []
                                 for obj_str in objects:
@@ -1,7 +1,10 @@
 """
 Tests for OpenAPI parser.
 """
+from collections import OrderedDict
+
 import pytest
+from app.services import openapi_parser
 from app.services.openapi_parser import OpenAPIParser
 
 
@@ -28,7 +31,7 @@ def test_parse_simple_openapi():
     }
     
     parser = OpenAPIParser(spec_dict=spec)
-    resolved = parser.parse()
+    resolved = parser.parse(validate=True)
     
     assert resolved is not None
     assert resolved["info"]["title"] == "Test API"
@@ -37,7 +40,173 @@ def test_parse_simple_openapi():
     assert len(endpoints) == 1
     assert endpoints[0]["path"] == "/users"
     assert endpoints[0]["method"] == "GET"
+    assert parser.count_endpoints() == 1
+    assert list(parser.iter_endpoints()) == endpoints
+
+
+def test_schema_count():
+    """Test that the schema count is recorded while parsing."""
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Test API", "version": "1.0.0"},
+        "paths": {},
+        "components": {
+            "schemas": {
+                "User": {"type": "object"},
+                "Pet": {"type": "object"},
+            }
+        }
+    }
+    
+    parser = OpenAPIParser(spec_dict=spec)
+    parser.parse()
+    
+    assert parser.schema_count == 2
+
+
+def test_parse_reuses_cached_spec(monkeypatch):
+    """Test that parsing identical specs reuses the cached resolved spec."""
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Cached API", "version": "1.0.0"},
+        "paths": {
+            "/pets": {
+                "get": {
+                    "operationId": "getPets",
+                    "responses": {"200": {"description": "Success"}}
+                }
+            }
+        }
+    }
+    
+    resolved_roots = []
+    resolve_refs = openapi_parser._resolve_refs
+    
+    def counting_resolve_refs(node, root, seen, memo):
+        if node is root:
+            resolved_roots.append(root)
+        return resolve_refs(node, root, seen, memo)
+    
+    monkeypatch.setattr(openapi_parser, "_PARSE_CACHE", OrderedDict())
+    monkeypatch.setattr(openapi_parser, "_resolve_refs", counting_resolve_refs)
+    
+    first = OpenAPIParser(spec_dict=spec).parse()
+    second = OpenAPIParser(spec_dict=dict(spec)).parse()
+    
+    assert len(resolved_roots) == 1
+    assert second is first
+
+
+def test_cached_spec_is_independent_of_spec_dict():
+    """Test that mutating the input spec_dict after parsing doesn't change the cached spec."""
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Isolated API", "version": "1.0.0"},
+        "paths": {
+            "/orders": {
+                "get": {
+                    "operationId": "getOrders",
+                    "responses": {"200": {"description": "Success"}}
+                }
+            }
+        }
+    }
+    
+    OpenAPIParser(spec_dict=spec).parse()
+    spec["paths"]["/orders"]["get"]["responses"]["404"] = {"description": "Missing"}
+    
+    mutated = OpenAPIParser(spec_dict=spec).parse()
+    spec["paths"]["/orders"]["get"]["responses"].pop("404")
+    
+    original = OpenAPIParser(spec_dict=spec).parse()
+    
+    assert set(mutated["paths"]["/orders"]["get"]["responses"]) == {"200", "404"}
+    assert set(original["paths"]["/orders"]["get"]["responses"]) == {"200"}
+
+
+def test_parse_resolves_refs():
+    """Test that local $refs are resolved and recursive refs are left in place."""
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Ref API", "version": "1.0.0"},
+        "paths": {
+            "/nodes": {
+                "get": {
+                    "operationId": "getNodes",
+                    "responses": {
+                        "200": {
+                            "description": "Success",
+                            "content": {
+                                "application/json": {
+                                    "schema": {"$ref": "#/components/schemas/Node"}
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        },
+        "components": {
+            "schemas": {
+                "Node": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"$ref": "#/components/schemas/Name"},
+                        "parent": {"$ref": "#/components/schemas/Node"}
+                    }
+                },
+                "Name": {"type": "string"}
+            }
+        }
+    }
+    
+    resolved = OpenAPIParser(spec_dict=spec).parse()
+    
+    schema = resolved["paths"]["/nodes"]["get"]["responses"]["200"]["content"]["application/json"]["schema"]
+    assert schema["properties"]["name"] == {"type": "string"}
+    assert schema["properties"]["parent"] == {"$ref": "#/components/schemas/Node"}
+    assert spec["components"]["schemas"]["Node"]["properties"]["name"] == {"$ref": "#/components/schemas/Name"}
 
 
+def test_path_level_parameters_are_merged():
+    """Test that path-item parameters apply to each operation, with operation overrides."""
+    spec = {
+        "openapi": "3.0.0",
+        "info": {"title": "Params API", "version": "1.0.0"},
+        "paths": {
+            "/users/{id}": {
+                "parameters": [
+                    {"name": "id", "in": "path", "required": True, "schema": {"type": "string"}},
+                    {"name": "verbose", "in": "query", "schema": {"type": "boolean"}}
+                ],
+                "get": {
+                    "operationId": "getUser",
+                    "parameters": [
+                        {"name": "verbose", "in": "query", "schema": {"type": "integer"}}
+                    ],
+                    "responses": {"200": {"description": "Success"}}
+                }
+            }
+        }
+    }
+    
+    parser = OpenAPIParser(spec_dict=spec)
+    parser.parse()
+    
+    endpoint = parser.get_endpoints()[0]
+    params = {(p["name"], p["in"]): p for p in endpoint["parameters"]}
+    assert set(params) == {("id", "path"), ("verbose", "query")}
+    assert params[("verbose", "query")]["schema"] == {"type": "integer"}
 
 
+def test_validation_leaves_spec_directory_untouched(tmp_path):
+    """Test that validating a spec file doesn't write anything next to it."""
+    spec_file = tmp_path / "spec.json"
+    spec_file.write_text(
+        '{"openapi": "3.0.0", "info": {"title": "File API", "version": "1.0.0"}, "paths": {}}'
+    )
+    
+    OpenAPIParser(spec_path=str(spec_file)).parse(validate=True)
+    OpenAPIParser(spec_path=str(spec_file)).parse(validate=True)
+    
+    assert [p.name for p in tmp_path.iterdir()] == ["spec.json"]
@@ -0,0 +1,81 @@
+"""
+Tests for secret encryption and API key hashing.
+"""
+import base64
+
+import pytest
+from cryptography.fernet import Fernet
+
+from app.core import security
+from app.core.config import settings
+
+
+@pytest.fixture
+def encryption_key(monkeypatch):
+    """Use a fresh, valid ENCRYPTION_KEY and reset the cached ciphers around each test."""
+    monkeypatch.setattr(settings, "ENCRYPTION_KEY", Fernet.generate_key().decode())
+    security.get_fernet.cache_clear()
+    security.get_aead.cache_clear()
+    yield settings.ENCRYPTION_KEY
+    security.get_fernet.cache_clear()
+    security.get_aead.cache_clear()
+
+
+def test_encrypt_decrypt_round_trip(encryption_key):
+    """Test that encrypted secrets decrypt back to the original text."""
+    token = security.encrypt_data("s3cr3t-api-key")
+
+    assert token != "s3cr3t-api-key"
+    assert security.decrypt_data(token) == "s3cr3t-api-key"
+
+
+def test_encrypt_uses_fresh_nonce(encryption_key):
+    """Test that encrypting the same value twice gives different tokens."""
+    assert security.encrypt_data("value") != security.encrypt_data("value")
+
+
+def test_decrypt_legacy_fernet_token(encryption_key):
+    """Test that tokens written before AES-GCM (Fernet) still decrypt."""
+    legacy_token = Fernet(encryption_key.encode()).encrypt(b"legacy-secret").decode()
+
+    assert security.decrypt_data(legacy_token) == "legacy-secret"
+
+
+def test_aead_key_is_not_the_fernet_key(encryption_key):
+    """Test that the AES-GCM key is derived from, not equal to, ENCRYPTION_KEY."""
+    raw_key = base64.urlsafe_b64decode(encryption_key)
+    token = base64.urlsafe_b64decode(security.encrypt_data("value"))
+    nonce, ciphertext = token[:12], token[12:]
+
+    with pytest.raises(Exception):
+        security.AESGCM(raw_key).decrypt(nonce, ciphertext, None)
+
+
+def test_decrypt_with_changed_key_fails(encryption_key, monkeypatch):
+    """Test that a token can't be decrypted after ENCRYPTION_KEY changes."""
+    token = security.encrypt_data("value")
+    monkeypatch.setattr(settings, "ENCRYPTION_KEY", Fernet.generate_key().decode())
+    security.get_fernet.cache_clear()
+    security.get_aead.cache_clear()
+
+    with pytest.raises(ValueError):
+        security.decrypt_data(token)
+
+
+def test_verify_api_key_round_trip():
+    """Test that a key verifies against its own hash and a different key doesn't."""
+    hashed = security.hash_api_key("atg_live_4f9c2e7b1d")
+
+    assert hashed != "atg_live_4f9c2e7b1d"
+    assert security.verify_api_key("atg_live_4f9c2e7b1d", hashed)
+    assert not security.verify_api_key("atg_live_4f9c2e7b1e", hashed)
+
+
+def test_api_key_hash_depends_on_secret_key(monkeypatch):
+    """Test that stored API key hashes stop verifying when SECRET_KEY changes."""
+    monkeypatch.setattr(settings, "SECRET_KEY", "original-secret-key")
+    hashed = security.hash_api_key("atg_live_4f9c2e7b1d")
+    monkeypatch.setattr(settings, "SECRET_KEY", "rotated-secret-key")
+
+    assert security.hash_api_key("atg_live_4f9c2e7b1d") != hashed
+    assert not security.verify_api_key("atg_live_4f9c2e7b1d", hashed)
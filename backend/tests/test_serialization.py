@@ -0,0 +1,43 @@
+"""
+Tests for JSON serialization helpers.
+"""
+import pytest
+
+from app.core import serialization
+
+
+@pytest.fixture(params=["orjson", "stdlib"])
+def backend(request, monkeypatch):
+    """Run a test against orjson (when installed) and the stdlib json fallback."""
+    if request.param == "orjson":
+        if serialization.orjson is None:
+            pytest.skip("orjson not installed")
+    else:
+        monkeypatch.setattr(serialization, "orjson", None)
+    return request.param
+
+
+def test_json_dumps_is_compact(backend):
+    """Test that both backends produce the same compact text."""
+    data = {"b": [1, 2], "a": {"x": "y"}}
+
+    assert serialization.json_dumps(data) == '{"b":[1,2],"a":{"x":"y"}}'
+    assert serialization.json_dumps(data, sort_keys=True) == '{"a":{"x":"y"},"b":[1,2]}'
+    assert serialization.json_bytes(data) == b'{"b":[1,2],"a":{"x":"y"}}'
+
+
+def test_json_loads_round_trip(backend):
+    """Test that dumped JSON loads back to the same value."""
+    data = {"name": "pet", "tags": ["a", "b"], "count": 3, "ratio": 0.5, "ok": True, "none": None}
+
+    assert serialization.json_loads(serialization.json_dumps(data)) == data
+    assert serialization.json_loads(serialization.json_bytes(data)) == data
+
+
+def test_json_dumps_jsonb_replaces_nul_escapes(backend):
+    """Test that NUL characters are replaced but an escaped backslash before "u0000" is kept."""
+    data = {"body": "a\x00b", "literal": "\\u0000", "both": "\\\x00"}
+
+    assert serialization.json_loads(serialization.json_dumps_jsonb(data)) == {
+        "body": "a\ufffdb", "literal": "\\u0000", "both": "\\\ufffd",
+    }
@@ -0,0 +1,349 @@
+"""
+Tests for the test executor, run against a local stub HTTP server.
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from app.core.security import encrypt_data
+from app.core.serialization import json_dumps_jsonb, json_loads
+from app.services import test_executor as test_executor_module
+from app.services.test_executor import TestExecutor
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """
+    Tiny JSON API: POST /items creates an item, GET /items[/{id}] reads them and
+    POST /token issues OAuth2 tokens. GET /binary returns bytes with NULs in them.
+    GET ?delay=<seconds> slows a response down.
+    """
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(('GET', self.path))
+            server.auth_headers.append(self.headers.get('Authorization'))
+        path, _, query = self.path.partition('?')
+        if query.startswith('delay='):
+            time.sleep(float(query.split('=', 1)[1]))
+        if path == '/binary':
+            data = b'\x00\x01binary\x00body'
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/octet-stream')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        elif path == '/items':
+            self._send_json(200, [{'id': item_id} for item_id in sorted(server.items)])
+        elif path.startswith('/items/'):
+            item_id = path.rsplit('/', 1)[1]
+            if item_id in server.items:
+                self._send_json(200, {'id': item_id, 'name': server.items[item_id]})
+            else:
+                self._send_json(404, {'detail': 'Not found'})
+        else:
+            self._send_json(404, {'detail': 'Not found'})
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        if self.path == '/token':
+            with server.lock:
+                server.token_requests += 1
+            self._send_json(200, {'access_token': 'stub-token', 'expires_in': 3600})
+            return
+        payload = json.loads(body) if body else {}
+        with server.lock:
+            server.requests.append(('POST', self.path))
+            item_id = str(len(server.items) + 1)
+            server.items[item_id] = payload.get('name', '')
+        self._send_json(201, {'id': item_id, 'name': payload.get('name', '')})
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+    server.lock = threading.Lock()
+    server.requests = []
+    server.items = {}
+    server.auth_headers = []
+    server.token_requests = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def base_url(stub_server):
+    host, port = stub_server.server_address
+    return f"http://{host}:{port}"
+
+
+def _list_items_test(**extra):
+    return {'type': 'happy_path', 'endpoint': '/items', 'method': 'GET', 'expected_status': [200], **extra}
+
+
+def test_execute_test_records_trace_and_body_by_default(base_url):
+    """Test that results carry a trace and the response body unless turned off."""
+    result = TestExecutor(base_url).execute_test(_list_items_test())
+
+    assert result['status'] == 'passed'
+    assert result['trace'][0]['response_status'] == 200
+    assert json.loads(result['response_body']) == []
+
+
+def test_execute_test_without_traces_or_bodies(base_url):
+    """Test that collect_traces / capture_response_bodies turn those parts off."""
+    executor = TestExecutor(base_url, collect_traces=False, capture_response_bodies=False)
+
+    result = executor.execute_test(_list_items_test())
+
+    assert result['status'] == 'passed'
+    assert 'trace' not in result
+    assert result['response_body'] != '[]'
+
+
+def test_body_assertion_still_captures_body(base_url, stub_server):
+    """Test that a response_body assertion gets the body even when capture is off."""
+    stub_server.items['1'] = 'first'
+    executor = TestExecutor(base_url, capture_response_bodies=False)
+
+    result = executor.execute_test(_list_items_test(assertions=[
+        {'type': 'response_body', 'condition': 'exists', 'field': '0.id', 'expected_value': True}
+    ]))
+
+    assert result['status'] == 'passed'
+    assert json.loads(result['response_body']) == [{'id': '1'}]
+
+
+def test_binary_body_result_is_storable_as_jsonb(base_url):
+    """Test that a result with NULs in the response body serializes without \\u0000 escapes."""
+    result = TestExecutor(base_url).execute_test(
+        {'type': 'happy_path', 'endpoint': '/binary', 'method': 'GET', 'expected_status': [200]}
+    )
+
+    stored = json_dumps_jsonb([result])
+
+    assert result['status'] == 'passed'
+    assert '\\u0000' not in stored
+    assert 'binary' in json_loads(stored)[0]['trace'][0]['response_body']
+
+
+def _response(content, content_type):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = content
+    response.headers['Content-Type'] = content_type
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+@pytest.mark.parametrize('content, content_type, text', [
+    # Unknown charset: fall back to UTF-8 instead of dropping the body
+    ('héllo'.encode(), 'text/plain; charset=x-unknown', 'héllo'),
+    # No charset: detect it, as Response.text does
+    (b'\xff\xfe' + 'hello world'.encode('utf-16-le'), 'application/octet-stream', 'hello world'),
+])
+def test_body_preview_decoding(content, content_type, text):
+    """Test that body previews decode bodies with unknown or missing charsets."""
+    response = _response(content, content_type)
+
+    assert test_executor_module._body_preview(response) == (text, False)
+    assert test_executor_module._ResponseSnapshot(response).text == text
+
+
+def _read_item_test(item_id, delay=None):
+    return {
+        'type': 'happy_path',
+        'endpoint': f'/items/{item_id}',
+        'method': 'GET',
+        'payload': {'delay': delay} if delay else {},
+        'expected_status': [200],
+    }
+
+
+def test_concurrent_tests_yield_in_suite_order(base_url, stub_server):
+    """Test that concurrently run GET tests are reported in suite order."""
+    stub_server.items.update({'1': 'a', '2': 'b', '3': 'c'})
+    test_cases = [_read_item_test('1', delay=0.3), _read_item_test('2', delay=0.1), _read_item_test('3')]
+
+    outcomes = list(TestExecutor(base_url).iter_test_results(test_cases))
+
+    assert [test_case for test_case, _, _ in outcomes] == test_cases
+    assert [json.loads(result['response_body'])['id'] for _, result, _ in outcomes] == ['1', '2', '3']
+    assert all(error is None for _, _, error in outcomes)
+
+
+def test_concurrent_context_updates_apply_in_suite_order(base_url, stub_server):
+    """Test that values extracted by concurrent tests reach the context in suite order."""
+    stub_server.items.update({'1': 'a', '2': 'b'})
+    executor = TestExecutor(base_url)
+    # The first test finishes last; its values must still be applied first
+    test_cases = [_read_item_test('1', delay=0.3), _read_item_test('2')]
+
+    seen_ids = [executor.context.get('id') for _ in executor.iter_test_results(test_cases)]
+
+    assert seen_ids == ['1', '2']
+    assert executor.context['id'] == '2'
+
+
+def test_concurrent_test_error_is_yielded_in_place(base_url, stub_server):
+    """Test that an exception in one concurrent test is reported for that test only."""
+    stub_server.items['1'] = 'a'
+    broken = {'type': 'happy_path', 'endpoint': 'curl GET', 'method': 'GET'}
+    test_cases = [_read_item_test('1'), broken, _list_items_test()]
+    executor = TestExecutor(base_url)
+
+    outcomes = list(executor.iter_test_results(test_cases))
+
+    assert outcomes[0][1]['status'] == 'passed'
+    assert outcomes[1][1] is None and isinstance(outcomes[1][2], ValueError)
+    assert outcomes[2][1]['status'] == 'passed'
+    with pytest.raises(ValueError):
+        executor.execute_test_suite(test_cases)
+
+
+def test_concurrent_tests_share_one_oauth2_token(base_url, stub_server):
+    """Test that a concurrent batch fetches the OAuth2 token once and sends it on every request."""
+    stub_server.items.update({'1': 'a', '2': 'b'})
+    credentials = encrypt_data(json.dumps({
+        'token_url': f'{base_url}/token',
+        # Unique per server so the process-wide token cache can't serve it
+        'client_id': f'client-{base_url}',
+        'client_secret': 'secret',
+    }))
+    executor = TestExecutor(base_url, auth_type='oauth2', auth_credentials=credentials)
+    test_cases = [_read_item_test('1'), _read_item_test('2'), _list_items_test(), _list_items_test()]
+
+    summary = executor.execute_test_suite(test_cases)
+
+    assert summary['passed'] == 4
+    assert stub_server.token_requests == 1
+    assert stub_server.auth_headers == ['Bearer stub-token'] * 4
+
+
+def test_integration_flow_reads_run_as_wave_in_flow_order(base_url, stub_server):
+    """Test that a wave of concurrent GET steps reports results and traces in flow order."""
+    test_case = {
+        'type': 'integration',
+        'name': 'Items integration',
+        'integration_flow': [
+            {'endpoint': '/items', 'method': 'POST', 'payload': {'name': 'first'}},
+            # Independent reads: sent together after the POST, the slowest one first
+            {'endpoint': '/items/1', 'method': 'GET', 'payload': {'delay': 0.3}},
+            {'endpoint': '/items', 'method': 'GET'},
+            {'endpoint': '/missing', 'method': 'GET'},
+        ],
+    }
+
+    result = TestExecutor(base_url).execute_test(test_case)
+
+    assert stub_server.requests[0] == ('POST', '/items')
+    assert [(step['method'], step['endpoint'], step['status']) for step in result['integration_results']] == [
+        ('POST', '/items', 201), ('GET', '/items/1', 200), ('GET', '/items', 200), ('GET', '/missing', 404),
+    ]
+    assert [step['step'] for step in result['trace']] == [1, 2, 3, 4]
+    assert result['status'] == 'failed'
+    assert '/missing' in result['error']
+
+
+def test_e2e_flow_prefetches_reads_after_earlier_writes(base_url, stub_server):
+    """Test that prefetched E2E reads see earlier writes and results stay in flow order."""
+    test_case = {
+        'type': 'e2e',
+        'name': 'Items scenario',
+        'e2e_flow': [
+            {'endpoint': '/items', 'method': 'POST', 'payload': {'name': 'first'}},
+            {'endpoint': '/items', 'method': 'GET', 'payload': {'delay': 0.2}},
+            {'endpoint': '/items/1', 'method': 'GET'},
+            {'endpoint': '/items', 'method': 'POST', 'payload': {'name': 'second'}},
+            # Path parameter filled from the context, so not prefetched
+            {'endpoint': '/items/{id}', 'method': 'GET'},
+        ],
+    }
+
+    result = TestExecutor(base_url).execute_test(test_case)
+
+    assert result['status'] == 'passed'
+    assert [(step['method'], step['endpoint']) for step in result['e2e_results']] == [
+        ('POST', '/items'), ('GET', '/items'), ('GET', '/items/1'), ('POST', '/items'), ('GET', '/items/2'),
+    ]
+    assert json.loads(result['trace'][1]['response_body']) == [{'id': '1'}]
+    assert stub_server.requests[-2:] == [('POST', '/items'), ('GET', '/items/2')]
+
+
+def _get_requests(stub_server):
+    return [path for method, path in stub_server.requests if method == 'GET']
+
+
+def test_cacheable_get_is_served_from_cache(base_url, stub_server):
+    """Test that repeated cacheable GETs hit the server once and still see status, headers and body."""
+    stub_server.items['1'] = 'a'
+    executor = TestExecutor(base_url)
+    test_case = _read_item_test('1')
+    test_case['cacheable'] = True
+    test_case['assertions'] = [
+        {'type': 'response_body', 'condition': 'equals', 'field': 'name', 'expected_value': 'a'},
+        {'type': 'response_header', 'condition': 'contains', 'field': 'content-type', 'expected_value': 'json'},
+    ]
+
+    first = executor.execute_test(test_case)
+    second = executor.execute_test(test_case)
+
+    assert _get_requests(stub_server) == ['/items/1']
+    assert first['status'] == second['status'] == 'passed'
+    assert second['response_body'] == first['response_body']
+
+
+def test_cached_get_expires_after_ttl(base_url, stub_server, monkeypatch):
+    """Test that a cached response older than the TTL is fetched again."""
+    monkeypatch.setattr(test_executor_module, '_RESPONSE_CACHE_TTL_SECONDS', 0.0)
+    executor = TestExecutor(base_url)
+
+    executor.execute_test(_list_items_test(cacheable=True))
+    executor.execute_test(_list_items_test(cacheable=True))
+
+    assert _get_requests(stub_server) == ['/items', '/items']
+
+
+def test_cached_get_evicts_least_recently_used(base_url, stub_server, monkeypatch):
+    """Test that the response cache keeps at most _RESPONSE_CACHE_SIZE entries."""
+    monkeypatch.setattr(test_executor_module, '_RESPONSE_CACHE_SIZE', 1)
+    stub_server.items['1'] = 'a'
+    executor = TestExecutor(base_url)
+    read_item = dict(_read_item_test('1'), cacheable=True)
+
+    for test_case in (read_item, _list_items_test(cacheable=True), read_item):
+        executor.execute_test(test_case)
+
+    assert _get_requests(stub_server) == ['/items/1', '/items', '/items/1']
+    assert len(executor._response_cache) == 1
+
+
+@pytest.mark.parametrize('actual, condition, expected, passed', [
+    (5, 'greater_than', 3, True),
+    ('5.5', 'greater_than', 5, True),
+    (2.5, 'less_than', '3', True),
+    ('abc', 'less_than', 3, False),
+    # Ints are compared after float() rounding, like string operands
+    (2 ** 53 + 1, 'greater_than', 2 ** 53, False),
+])
+def test_numeric_conditions(actual, condition, expected, passed):
+    """Test greater_than / less_than across int, float and numeric-string operands."""
+    assert TestExecutor('http://localhost')._check_condition(actual, condition, expected) is passed
@@ -0,0 +1,135 @@
+"""
+Tests for test case generation.
+"""
+import threading
+import time
+
+import pytest
+from app.services.openapi_parser import OpenAPIParser
+from app.services.test_generator import TestGenerator
+
+
+def _recursive_spec():
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Tree API", "version": "1.0.0"},
+        "paths": {
+            "/nodes": {
+                "post": {
+                    "operationId": "createNode",
+                    "requestBody": {
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/Node"}
+                            }
+                        }
+                    },
+                    "responses": {"201": {"description": "Created"}}
+                }
+            }
+        },
+        "components": {
+            "schemas": {
+                "Node": {
+                    "type": "object",
+                    "required": ["name"],
+                    "properties": {
+                        "name": {"type": "string"},
+                        "child": {"$ref": "#/components/schemas/Node"}
+                    }
+                }
+            }
+        }
+    }
+
+
+@pytest.fixture
+def recursive_generator():
+    parser = OpenAPIParser(spec_dict=_recursive_spec())
+    parser.parse()
+    return TestGenerator(parser)
+
+
+def test_resolve_schema_refs_stops_at_recursive_ref(recursive_generator):
+    """Test that a self-referencing schema resolves without recursing forever."""
+    schema = recursive_generator._resolve_schema_refs({"$ref": "#/components/schemas/Node"})
+
+    assert schema["properties"]["name"] == {"type": "string"}
+    assert schema["properties"]["child"] == {"$ref": "#/components/schemas/Node"}
+
+
+def test_sample_payload_for_recursive_schema(recursive_generator):
+    """Test that payload generation for a self-referencing schema terminates."""
+    endpoint = recursive_generator.parser.get_endpoints()[0]
+
+    payload = recursive_generator._generate_sample_payload(endpoint)
+
+    # The child is expanded once, then the back-reference to Node is left out
+    assert isinstance(payload["name"], str)
+    assert isinstance(payload["child"]["name"], str)
+    assert "child" not in payload["child"]
+
+
+def test_baseline_generation_for_recursive_schema(recursive_generator):
+    """Test that baseline generation succeeds for specs with recursive refs."""
+    tests = recursive_generator.generate_all_tests(enabled_types=["happy_path"])
+
+    assert tests
+    assert all(test["endpoint"] == "/nodes" for test in tests)
+
+
+def _items_spec(count):
+    return {
+        "openapi": "3.0.0",
+        "info": {"title": "Items API", "version": "1.0.0"},
+        "paths": {
+            f"/items{i}": {
+                "get": {"operationId": f"getItems{i}", "responses": {"200": {"description": "Success"}}}
+            }
+            for i in range(count)
+        }
+    }
+
+
+def test_llm_generation_runs_concurrently_in_endpoint_order(monkeypatch):
+    """Test that concurrent LLM generation overlaps calls but keeps endpoint order."""
+    parser = OpenAPIParser(spec_dict=_items_spec(6))
+    parser.parse()
+    generator = TestGenerator(parser, llm_api_key="test-key")
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_llm_tests(endpoint):
+        with lock:
+            active.append(endpoint["path"])
+            peak.append(len(active))
+        # Earlier endpoints answer slower, so completion order is reversed
+        time.sleep(0.05 * (6 - int(endpoint["path"][-1])))
+        with lock:
+            active.remove(endpoint["path"])
+        return [{"type": "happy_path", "endpoint": endpoint["path"]}]
+
+    monkeypatch.setattr(generator, "_generate_llm_tests", fake_llm_tests)
+
+    tests = generator.generate_all_tests(enabled_types=["happy_path"])
+
+    assert [test["endpoint"] for test in tests] == [f"/items{i}" for i in range(6)]
+    assert max(peak) > 1
+
+
+def test_llm_generation_failure_aborts_run(monkeypatch):
+    """Test that one failing endpoint still fails the whole concurrent generation."""
+    parser = OpenAPIParser(spec_dict=_items_spec(3))
+    parser.parse()
+    generator = TestGenerator(parser, llm_api_key="test-key")
+
+    def fake_llm_tests(endpoint):
+        if endpoint["path"] == "/items1":
+            raise ValueError("bad LLM response")
+        return [{"type": "happy_path", "endpoint": endpoint["path"]}]
+
+    monkeypatch.setattr(generator, "_generate_llm_tests", fake_llm_tests)
+
+    with pytest.raises(RuntimeError, match="bad LLM response"):
+        generator.generate_all_tests()